@@ -2,20 +2,22 @@
 Main entry point for GDPR Compliance RAG System
 Provides CLI interface and workflow orchestration
 """
-import sys
+import os
 from pathlib import Path
-sys.path.append(str(Path(__file__).parent / "src"))
+
+# Let idle OpenMP threads sleep between searches; must run before faiss/torch load
+os.environ.setdefault("OMP_WAIT_POLICY", "PASSIVE")
+os.environ.setdefault("KMP_BLOCKTIME", "0")
 
 import argparse
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from loguru import logger
 
-from utils import load_config, setup_logging, ensure_directories
-from data_collection.orchestrator import DataCollectionOrchestrator
-from preprocessing.document_processor import GDPRDocumentProcessor
-from vectorstore.faiss_store import FAISSVectorStore
-from rag.gdpr_rag import GDPRRAGSystem
-from violation_finder.violation_finder import GDPRViolationFinder
+from src.utils import load_config, setup_logging, ensure_directories, resolve_embedding_device, set_faiss_threads, write_text_async
+
+# Pipeline modules (and faiss/torch behind them) are imported inside the
+# command that needs them, so `--help` and light commands start instantly
 
 
 def setup_system(config_path: str = "config.yaml"):
@@ -28,6 +30,8 @@ def setup_system(config_path: str = "config.yaml"):
 
 def collect_data(config):
     """Run data collection from all sources"""
+    from src.data_collection.orchestrator import DataCollectionOrchestrator
+    
     logger.info("Starting data collection...")
     orchestrator = DataCollectionOrchestrator(config)
     results = orchestrator.collect_all()
@@ -37,15 +41,19 @@ def collect_data(config):
 
 def process_documents(config):
     """Process collected documents into chunks"""
+    from src.preprocessing.document_processor import GDPRDocumentProcessor
+    
     logger.info("Starting document processing...")
     processor = GDPRDocumentProcessor(config)
-    chunks = processor.process_all_documents()
-    logger.info(f"Document processing complete. Created {len(chunks)} chunks")
-    return chunks
+    total_chunks = processor.process_all_documents()
+    logger.info(f"Document processing complete. Created {total_chunks} chunks")
+    return total_chunks
 
 
 def build_vectorstore(config):
     """Build FAISS vector store from processed chunks"""
+    from src.vectorstore.faiss_store import FAISSVectorStore
+    
     logger.info("Building vector store...")
     
     # Load processed chunks
@@ -59,8 +67,9 @@ def build_vectorstore(config):
     with open(chunks_file, 'r', encoding='utf-8') as f:
         chunks = json.load(f)
     
-    # Build vector store
-    vector_store = FAISSVectorStore(config)
+    # Build vector store (training and adding vectors run on all configured threads)
+    set_faiss_threads(config)
+    vector_store = FAISSVectorStore(resolve_embedding_device(config))
     vector_store.build_index_from_chunks(chunks)
     vector_store.save_index()
     
@@ -76,30 +85,33 @@ def build_vectorstore(config):
 
 def run_query(config, query: str, top_k: int = 5):
     """Run a single query against the RAG system"""
+    from src.rag.gdpr_rag import GDPRRAGSystem
+    
     logger.info(f"Processing query: {query}")
     
     rag = GDPRRAGSystem(config)
     result = rag.query(query, top_k=top_k)
     
-    print("\n" + "="*80)
-    print(f"Query: {query}")
-    print("="*80)
-    print(f"\nAnswer:\n{result['answer']}\n")
+    # Build the whole output first and write it in one call
+    lines = ["\n" + "="*80, f"Query: {query}", "="*80, f"\nAnswer:\n{result['answer']}\n"]
     
     if result.get('sources'):
-        print(f"\nSources ({len(result['sources'])}):")
+        lines.append(f"\nSources ({len(result['sources'])}):")
         for i, source in enumerate(result['sources'], 1):
-            print(f"\n{i}. {source['source']} - {source['document_type']}")
+            lines.append(f"\n{i}. {source['source']} - {source['document_type']}")
             if source.get('article_number'):
-                print(f"   Article {source['article_number']}")
-            print(f"   Score: {source['score']:.3f}")
-            print(f"   {source['text'][:200]}...")
+                lines.append(f"   Article {source['article_number']}")
+            lines.append(f"   Score: {source['score']:.3f}")
+            lines.append(f"   {source['preview']}...")
     
-    print("\n" + "="*80 + "\n")
+    lines.append("\n" + "="*80 + "\n")
+    print("\n".join(lines))
 
 
 def analyze_violation(config, scenario: str, output_file: str = None):
     """Analyze a scenario for GDPR violations"""
+    from src.violation_finder.violation_finder import GDPRViolationFinder
+    
     logger.info("Analyzing scenario for violations...")
     
     finder = GDPRViolationFinder(config)
@@ -108,18 +120,24 @@ def analyze_violation(config, scenario: str, output_file: str = None):
     # Generate report
     report = finder.generate_compliance_report(scenario, assessment, format="markdown")
     
+    # Save report if output file specified (written while the report is printed)
+    saved = write_text_async(output_file, report) if output_file else None
+    
     print(report)
     
-    # Save report if output file specified
-    if output_file:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(report)
+    if saved:
+        saved.result()
         logger.info(f"Report saved to: {output_file}")
 
 
 def run_interactive(config):
     """Run interactive Q&A session"""
-    rag = GDPRRAGSystem(config)
+    from src.rag.gdpr_rag import GDPRRAGSystem
+    
+    # Load models and index in the background while the user types the first question
+    executor = ThreadPoolExecutor(max_workers=1)
+    rag_future = executor.submit(GDPRRAGSystem, config)
+    executor.shutdown(wait=False)
     
     print("\n" + "="*80)
     print("GDPR Compliance RAG System - Interactive Mode")
@@ -137,18 +155,36 @@ def run_interactive(config):
                 print("\nGoodbye!")
                 break
             
-            result = rag.query(query)
-            print(f"\nAnswer:\n{result['answer']}\n")
+            try:
+                rag = rag_future.result()
+            except Exception as e:
+                # Start-up failures (missing index, Ollama down) would repeat on every question
+                logger.error(f"Failed to initialize RAG system: {e}")
+                break
+            
+            retrieved_docs = rag.retrieve_context(query)
+            
+            if not retrieved_docs:
+                print("\nAnswer:\nI couldn't find relevant information in the GDPR database to answer your question.\n")
+                continue
+            
+            # Print the answer as it is generated
+            print("\nAnswer:")
+            for piece in rag.generate_response_stream(query, rag.format_context(retrieved_docs)):
+                print(piece, end="", flush=True)
+            print("\n")
+            
+            print(f"Based on {len(retrieved_docs)} sources")
+            show_sources = input("Show sources? (y/n): ").strip().lower()
             
-            if result.get('sources'):
-                print(f"Based on {len(result['sources'])} sources")
-                show_sources = input("Show sources? (y/n): ").strip().lower()
-                
-                if show_sources == 'y':
-                    for i, source in enumerate(result['sources'], 1):
-                        print(f"\n{i}. {source['source']} - {source['document_type']}")
-                        if source.get('article_number'):
-                            print(f"   Article {source['article_number']}")
+            if show_sources == 'y':
+                lines = []
+                for i, doc in enumerate(retrieved_docs, 1):
+                    metadata = doc['metadata']
+                    lines.append(f"\n{i}. {metadata.get('source')} - {metadata.get('document_type')}")
+                    if metadata.get('article_number'):
+                        lines.append(f"   Article {metadata['article_number']}")
+                print("\n".join(lines))
         
         except KeyboardInterrupt:
             print("\n\nGoodbye!")
@@ -0,0 +1,19 @@
+"""
+Shared import setup for the scripts in this directory
+
+Import it before anything from the project: it puts the project root on
+sys.path (so the `src` package resolves) and sets the OpenMP environment
+that must be in place before faiss/torch load.
+"""
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# Let idle OpenMP threads sleep between searches; must run before faiss/torch load
+os.environ.setdefault("OMP_WAIT_POLICY", "PASSIVE")
+os.environ.setdefault("KMP_BLOCKTIME", "0")
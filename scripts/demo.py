@@ -1,22 +1,16 @@
 """
 Quick interactive demo of the GDPR RAG system
 """
-import sys
 from pathlib import Path
-sys.path.append(str(Path(__file__).parent / "src"))
+import _bootstrap  # noqa: F401  (sys.path and OpenMP setup)
 
-import yaml
-from rag.gdpr_rag import GDPRRAGSystem
-from violation_finder.violation_finder import GDPRViolationFinder
-
-# Load config
-with open('config.yaml', 'r') as f:
-    config = yaml.safe_load(f)
+from src.rag.gdpr_rag import get_rag_system
+from src.violation_finder.violation_finder import get_violation_finder
 
 # Initialize RAG system
 print("Loading GDPR RAG system...")
-rag = GDPRRAGSystem(config)
-rag.vector_store.load_index(Path("vectorstore/test_index"))
+rag = get_rag_system('config.yaml')
+rag.load_index(Path("vectorstore/test_index"))
 
 print("\n" + "="*80)
 print("GDPR RAG SYSTEM DEMO")
@@ -38,8 +32,8 @@ print("="*80)
 print("\n⚠️  Violation Analysis: Marketing without consent\n")
 print("Scenario: 'We send marketing emails to all website visitors without asking for consent'")
 
-finder = GDPRViolationFinder(config)
-finder.rag_system.vector_store.load_index(Path("vectorstore/test_index"))
+# Shares the RAG system (and the test index loaded above)
+finder = get_violation_finder('config.yaml')
 
 assessment = finder.analyze_scenario(
     "We send marketing emails to all website visitors without asking for consent"
@@ -1,13 +1,30 @@
 """
 Example usage scripts for GDPR RAG system
 """
-import sys
 from pathlib import Path
-sys.path.append(str(Path(__file__).parent))
+import _bootstrap  # noqa: F401  (sys.path and OpenMP setup)
 
-import yaml
-from rag.gdpr_rag import GDPRRAGSystem
-from violation_finder.violation_finder import GDPRViolationFinder
+from src.rag.gdpr_rag import get_rag_system
+from src.violation_finder.violation_finder import get_violation_finder
+from src.utils import write_text_async
+
+
+FITNESS_APP_SCENARIO = """
+    A fitness tracking app collects users' health data, location data, 
+    and exercise habits. The app shares this data with advertisers to 
+    show personalized ads. Users are not explicitly informed about this 
+    data sharing, and there is no option to opt out. The app stores all 
+    data indefinitely.
+    """
+
+ECOMMERCE_SCENARIO = """
+    An e-commerce website collects customer purchase history, payment 
+    information, and browsing behavior. The website uses cookies without 
+    obtaining prior consent. Customer data is transferred to servers in 
+    countries outside the EU without adequate safeguards. The website 
+    does not have a clear privacy policy, and customers cannot easily 
+    access or delete their data.
+    """
 
 
 def example_basic_query():
@@ -16,10 +33,7 @@ def example_basic_query():
     print("Example 1: Basic GDPR Query")
     print("="*80 + "\n")
     
-    with open('config.yaml', 'r') as f:
-        config = yaml.safe_load(f)
-    
-    rag = GDPRRAGSystem(config)
+    rag = get_rag_system('config.yaml')
     
     query = "What are the main principles of GDPR?"
     result = rag.query(query, top_k=3)
@@ -35,10 +49,7 @@ def example_article_specific():
     print("Example 2: Article-Specific Query")
     print("="*80 + "\n")
     
-    with open('config.yaml', 'r') as f:
-        config = yaml.safe_load(f)
-    
-    rag = GDPRRAGSystem(config)
+    rag = get_rag_system('config.yaml')
     
     # Query with filters for specific article
     query = "What does Article 6 say about legal basis?"
@@ -52,26 +63,17 @@ def example_article_specific():
     print(f"Answer:\n{result['answer']}\n")
 
 
-def example_violation_analysis():
-    """Example: Analyze scenario for violations"""
+def example_violation_analysis(assessment=None):
+    """Example: Analyze scenario for violations (optionally with a precomputed assessment)"""
     print("\n" + "="*80)
     print("Example 3: Violation Analysis")
     print("="*80 + "\n")
     
-    with open('config.yaml', 'r') as f:
-        config = yaml.safe_load(f)
+    finder = get_violation_finder('config.yaml')
     
-    finder = GDPRViolationFinder(config)
-    
-    scenario = """
-    A fitness tracking app collects users' health data, location data, 
-    and exercise habits. The app shares this data with advertisers to 
-    show personalized ads. Users are not explicitly informed about this 
-    data sharing, and there is no option to opt out. The app stores all 
-    data indefinitely.
-    """
-    
-    assessment = finder.analyze_scenario(scenario)
+    scenario = FITNESS_APP_SCENARIO
+    if assessment is None:
+        assessment = finder.analyze_scenario(scenario)
     
     print(f"Scenario: {scenario.strip()}\n")
     print(f"Risk Level: {assessment.overall_risk_level}")
@@ -90,10 +92,7 @@ def example_compliance_check():
     print("Example 4: Compliance Check")
     print("="*80 + "\n")
     
-    with open('config.yaml', 'r') as f:
-        config = yaml.safe_load(f)
-    
-    finder = GDPRViolationFinder(config)
+    finder = get_violation_finder('config.yaml')
     
     scenario = "We obtain user consent through a pre-checked checkbox on registration"
     requirement = "Article 4(11) - Valid Consent"
@@ -111,10 +110,7 @@ def example_batch_queries():
     print("Example 5: Batch Queries")
     print("="*80 + "\n")
     
-    with open('config.yaml', 'r') as f:
-        config = yaml.safe_load(f)
-    
-    rag = GDPRRAGSystem(config)
+    rag = get_rag_system('config.yaml')
     
     queries = [
         "What is a Data Protection Impact Assessment?",
@@ -130,39 +126,28 @@ def example_batch_queries():
         print("-" * 80)
 
 
-def example_report_generation():
-    """Example: Generate compliance report"""
+def example_report_generation(assessment=None):
+    """Example: Generate compliance report (optionally from a precomputed assessment)"""
     print("\n" + "="*80)
     print("Example 6: Compliance Report Generation")
     print("="*80 + "\n")
     
-    with open('config.yaml', 'r') as f:
-        config = yaml.safe_load(f)
-    
-    finder = GDPRViolationFinder(config)
-    
-    scenario = """
-    An e-commerce website collects customer purchase history, payment 
-    information, and browsing behavior. The website uses cookies without 
-    obtaining prior consent. Customer data is transferred to servers in 
-    countries outside the EU without adequate safeguards. The website 
-    does not have a clear privacy policy, and customers cannot easily 
-    access or delete their data.
-    """
+    finder = get_violation_finder('config.yaml')
     
-    assessment = finder.analyze_scenario(scenario)
+    scenario = ECOMMERCE_SCENARIO
+    if assessment is None:
+        assessment = finder.analyze_scenario(scenario)
     report = finder.generate_compliance_report(scenario, assessment, format="markdown")
     
-    # Save report
+    # Save report in the background while the summary is printed
     output_file = Path("example_compliance_report.md")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(report)
+    saved = write_text_async(output_file, report)
     
     print(f"Scenario analyzed and report generated")
-    print(f"Report saved to: {output_file}")
     print(f"\nRisk Level: {assessment.overall_risk_level}")
     print(f"Violations: {len(assessment.violations)}")
     print(f"Recommendations: {len(assessment.recommendations)}")
+    print(f"Report saved to: {saved.result()}")
 
 
 if __name__ == "__main__":
@@ -191,8 +176,20 @@ if __name__ == "__main__":
         examples[args.example - 1]()
     else:
         print("Running all examples...")
+        
+        # Retrieve context for both scenario examples in one batched search
+        example_kwargs = {}
+        try:
+            assessments = get_violation_finder('config.yaml').analyze_scenarios(
+                [FITNESS_APP_SCENARIO, ECOMMERCE_SCENARIO]
+            )
+            example_kwargs[example_violation_analysis] = {'assessment': assessments[0]}
+            example_kwargs[example_report_generation] = {'assessment': assessments[1]}
+        except Exception as e:
+            print(f"Error analyzing scenarios: {e}")
+        
         for example_func in examples:
             try:
-                example_func()
+                example_func(**example_kwargs.get(example_func, {}))
             except Exception as e:
                 print(f"Error in {example_func.__name__}: {e}")
@@ -7,9 +7,9 @@ import sys
 import time
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import _bootstrap  # noqa: F401  (sys.path and OpenMP setup)
 
-import yaml
+from src.utils import load_config
 from src.violation_finder.violation_finder import GDPRViolationFinder
 from loguru import logger
 
@@ -27,8 +27,7 @@ def main():
     start_time = time.time()
     
     # Load config
-    with open("config.yaml", 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_config("config.yaml")
     
     # Initialize violation finder
     print("🔧 Initializing system...")
@@ -25,13 +25,11 @@ read -p "Press Enter to continue..."
 echo ""
 echo "⚙️  Step 1/2: Re-processing documents with improved chunking..."
 python -c "
-import sys
 from pathlib import Path
-sys.path.append(str(Path.cwd() / 'src'))
 
 import yaml
 import json
-from preprocessing.document_processor import GDPRDocumentProcessor
+from src.preprocessing.document_processor import GDPRDocumentProcessor
 
 # Load config
 with open('config.yaml', 'r') as f:
@@ -59,13 +57,12 @@ print(f'✓ Saved to: {output_file}')
 echo ""
 echo "🔨 Step 2/2: Building improved vector store..."
 python -c "
-import sys
 from pathlib import Path
-sys.path.append(str(Path.cwd() / 'src'))
 
 import yaml
 import json
-from vectorstore.faiss_store import FAISSVectorStore
+from src.utils import resolve_embedding_device, set_faiss_threads
+from src.vectorstore.faiss_store import FAISSVectorStore
 
 # Load config
 with open('config.yaml', 'r') as f:
@@ -79,8 +76,9 @@ with open(chunks_file, 'r', encoding='utf-8') as f:
 print(f'Building with {len(chunks)} chunks...')
 print('Using higher quality embeddings (all-mpnet-base-v2, 768-dim)...')
 
-# Build vector store
-vector_store = FAISSVectorStore(config)
+# Build vector store (HNSW insertion runs on all configured threads)
+set_faiss_threads(config)
+vector_store = FAISSVectorStore(resolve_embedding_device(config))
 vector_store.build_index_from_chunks(chunks)
 
 # Save
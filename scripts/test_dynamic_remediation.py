@@ -6,11 +6,12 @@ Test Dynamic Remediation Engine (LLM-driven, no templates)
 import sys
 import time
 from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+import _bootstrap  # noqa: F401  (sys.path and OpenMP setup)
 
-import yaml
 from loguru import logger
 
+from src.utils import load_config
+
 # Configure logging
 logger.remove()
 logger.add(sys.stdout, format="<green>{time:HH:mm:ss}</green> | {message}", level="INFO")
@@ -23,14 +24,13 @@ def main():
     
     # Load config
     config_path = Path(__file__).parent.parent / 'config.yaml'
-    with open(config_path) as f:
-        config = yaml.safe_load(f)
+    config = load_config(str(config_path))
     
     start_time = time.time()
     
     # Initialize system
     print("🔧 Initializing system...")
-    from violation_finder.violation_finder import GDPRViolationFinder
+    from src.violation_finder.violation_finder import GDPRViolationFinder
     finder = GDPRViolationFinder(config)
     init_time = time.time() - start_time
     print(f"✅ Initialized in {init_time:.2f}s")
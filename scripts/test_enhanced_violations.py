@@ -8,13 +8,13 @@ Demonstrates:
 4. Professional compliance reports
 """
 import sys
+from collections import Counter
 from pathlib import Path
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import _bootstrap  # noqa: F401  (sys.path and OpenMP setup)
 
-import yaml
-from src.violation_finder.violation_finder import GDPRViolationFinder
+from src.violation_finder.violation_finder import get_violation_finder
+from src.utils import write_text_async
 from loguru import logger
 
 # Configure logging
@@ -28,12 +28,8 @@ def test_scenario_analysis():
     print("TEST 1: Scenario Analysis with Enhanced Citations")
     print("="*100 + "\n")
     
-    # Load config
-    with open("config.yaml", 'r') as f:
-        config = yaml.safe_load(f)
-    
-    # Initialize violation finder
-    finder = GDPRViolationFinder(config)
+    # Shared violation finder (models and index are loaded once per run)
+    finder = get_violation_finder("config.yaml")
     
     # Example scenario with clear violations
     scenario = """
@@ -57,27 +53,22 @@ def test_scenario_analysis():
     print("🔍 Analyzing for GDPR violations...\n")
     assessment = finder.analyze_scenario(scenario)
     
-    # Generate report
-    report = finder.generate_compliance_report(scenario, assessment, format="markdown")
-    
-    # Print report
-    print(report)
+    # Generate markdown and JSON reports from the same assessment
+    reports = finder.generate_compliance_reports(scenario, assessment, formats=("markdown", "json"))
+    report = reports["markdown"]
     
-    # Save report
+    # Save both reports in the background while the report is printed
     output_path = Path("logs/enhanced_violation_report.md")
     output_path.parent.mkdir(exist_ok=True)
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(report)
-    
-    print(f"\n✅ Report saved to: {output_path}")
-    
-    # Also save JSON version
-    json_report = finder.generate_compliance_report(scenario, assessment, format="json")
+    report_saved = write_text_async(output_path, report)
     json_path = Path("logs/enhanced_violation_report.json")
-    with open(json_path, 'w', encoding='utf-8') as f:
-        f.write(json_report)
+    json_saved = write_text_async(json_path, reports["json"])
     
-    print(f"✅ JSON report saved to: {json_path}")
+    # Print report
+    print(report)
+    
+    print(f"\n✅ Report saved to: {report_saved.result()}")
+    print(f"✅ JSON report saved to: {json_saved.result()}")
     
     return assessment
 
@@ -88,12 +79,8 @@ def test_document_analysis():
     print("TEST 2: Document Analysis with Text Highlighting")
     print("="*100 + "\n")
     
-    # Load config
-    with open("config.yaml", 'r') as f:
-        config = yaml.safe_load(f)
-    
-    # Initialize violation finder
-    finder = GDPRViolationFinder(config)
+    # Shared violation finder (models and index are loaded once per run)
+    finder = get_violation_finder("config.yaml")
     
     # Sample privacy policy with issues
     privacy_policy = """
@@ -124,15 +111,14 @@ def test_document_analysis():
     # Generate report
     report = finder.generate_compliance_report(privacy_policy, assessment, format="markdown")
     
+    # Save report in the background while it is printed
+    output_path = Path("logs/document_analysis_report.md")
+    report_saved = write_text_async(output_path, report)
+    
     # Print report
     print(report)
     
-    # Save report
-    output_path = Path("logs/document_analysis_report.md")
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(report)
-    
-    print(f"\n✅ Document analysis report saved to: {output_path}")
+    print(f"\n✅ Document analysis report saved to: {report_saved.result()}")
     
     return assessment
 
@@ -143,12 +129,8 @@ def test_specific_requirement():
     print("TEST 3: Specific Requirement Check")
     print("="*100 + "\n")
     
-    # Load config
-    with open("config.yaml", 'r') as f:
-        config = yaml.safe_load(f)
-    
-    # Initialize violation finder
-    finder = GDPRViolationFinder(config)
+    # Shared violation finder (models and index are loaded once per run)
+    finder = get_violation_finder("config.yaml")
     
     requirement = "Article 17 (Right to Erasure)"
     scenario = "Our system allows users to delete their account, but we keep their email address and transaction history for marketing purposes indefinitely."
@@ -174,36 +156,35 @@ def test_specific_requirement():
 
 def print_statistics(assessment):
     """Print assessment statistics"""
-    print("\n" + "="*100)
-    print("ASSESSMENT STATISTICS")
-    print("="*100 + "\n")
-    
-    print(f"📊 Overall Risk: {assessment.overall_risk_level} ({assessment.risk_score:.1f}/10)")
-    print(f"⚠️  Violations Found: {len(assessment.violations)}")
+    # Build the whole block first and write it in one call
+    lines = [
+        "\n" + "="*100,
+        "ASSESSMENT STATISTICS",
+        "="*100 + "\n",
+        f"📊 Overall Risk: {assessment.overall_risk_level} ({assessment.risk_score:.1f}/10)",
+        f"⚠️  Violations Found: {len(assessment.violations)}",
+    ]
     
     if assessment.violations:
-        print("\n🔍 Violations by Severity:")
-        severity_counts = {}
-        for v in assessment.violations:
-            severity_counts[v.severity] = severity_counts.get(v.severity, 0) + 1
+        lines.append("\n🔍 Violations by Severity:")
+        severity_counts = Counter(v.severity for v in assessment.violations)
+        lines.extend(f"   - {severity}: {count}" for severity, count in sorted(severity_counts.items()))
         
-        for severity, count in sorted(severity_counts.items()):
-            print(f"   - {severity}: {count}")
+        lines.append("\n📚 Citations Found:")
+        citations = [cit for v in assessment.violations for cit in (v.source_citations or [])]
+        lines.extend(
+            f"   - {cit.article_or_recital} (Relevance: {cit.relevance_score:.0%})"
+            for cit in citations
+        )
         
-        print("\n📚 Citations Found:")
-        total_citations = 0
-        for v in assessment.violations:
-            if v.source_citations:
-                total_citations += len(v.source_citations)
-                for cit in v.source_citations:
-                    print(f"   - {cit.article_or_recital} (Relevance: {cit.relevance_score:.0%})")
+        lines.append(f"\n✅ Total Source Citations: {len(citations)}")
         
-        print(f"\n✅ Total Source Citations: {total_citations}")
-        
-        print("\n🎯 Highlighted Issues:")
+        lines.append("\n🎯 Highlighted Issues:")
         for i, v in enumerate(assessment.violations, 1):
             if v.highlighted_text:
-                print(f"   {i}. {v.category}: \"{v.highlighted_text[:60]}...\"")
+                lines.append(f"   {i}. {v.category}: \"{v.highlighted_text[:60]}...\"")
+    
+    print("\n".join(lines))
 
 
 def main():
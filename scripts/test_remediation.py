@@ -3,11 +3,9 @@
 Test remediation engine improvements without LLM calls
 """
 
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+import _bootstrap  # noqa: F401  (sys.path and OpenMP setup)
 
-from remediation.remediation_engine import RemediationEngine
+from src.remediation.remediation_engine import RemediationEngine
 
 def test_remediation_engine():
     """Test that remediation templates are distinct and specific"""
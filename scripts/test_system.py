@@ -3,11 +3,12 @@ Quick test script to verify system functionality
 """
 import sys
 from pathlib import Path
-sys.path.append(str(Path(__file__).parent / "src"))
+import _bootstrap  # noqa: F401  (sys.path and OpenMP setup)
 
-import yaml
 from loguru import logger
 
+from src.utils import load_config, resolve_embedding_device, set_faiss_threads
+
 # Configure logging
 logger.remove()
 logger.add(sys.stdout, level="INFO")
@@ -19,8 +20,7 @@ print("="*80 + "\n")
 # Test 1: Load configuration
 print("Test 1: Loading configuration...")
 try:
-    with open('config.yaml', 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_config('config.yaml')
     print("✓ Configuration loaded successfully")
     print(f"  - Ollama model: {config['ollama']['model']}")
     print(f"  - Embedding model: {config['embeddings']['model_name']}")
@@ -31,7 +31,7 @@ except Exception as e:
 # Test 2: Test EUR-Lex collector (just fetch English GDPR)
 print("\nTest 2: Testing data collection (EUR-Lex GDPR - English only)...")
 try:
-    from data_collection.eur_lex_collector import EURLexCollector
+    from src.data_collection.eur_lex_collector import EURLexCollector
     
     collector = EURLexCollector()
     doc = collector.fetch_gdpr_text("EN")
@@ -54,7 +54,7 @@ except Exception as e:
 # Test 3: Test document processing
 print("\nTest 3: Testing document processing...")
 try:
-    from preprocessing.document_processor import GDPRDocumentProcessor
+    from src.preprocessing.document_processor import GDPRDocumentProcessor
     import json
     
     processor = GDPRDocumentProcessor(config)
@@ -68,8 +68,10 @@ try:
     output_dir = Path("data/processed")
     output_dir.mkdir(parents=True, exist_ok=True)
     
+    # Convert once; the vector store test below reuses the dicts
+    chunk_dicts = [chunk.to_dict() for chunk in chunks]
     with open(output_dir / "test_chunks.json", 'w', encoding='utf-8') as f:
-        json.dump([chunk.to_dict() for chunk in chunks], f, ensure_ascii=False, indent=2)
+        json.dump(chunk_dicts, f, ensure_ascii=False, indent=2)
     
 except Exception as e:
     print(f"✗ Error in processing: {e}")
@@ -80,13 +82,17 @@ except Exception as e:
 # Test 4: Test FAISS vector store
 print("\nTest 4: Testing FAISS vector store...")
 try:
-    from vectorstore.faiss_store import FAISSVectorStore
+    from src.vectorstore.faiss_store import FAISSVectorStore
     
-    vector_store = FAISSVectorStore(config)
-    vector_store.build_index_from_chunks([chunk.to_dict() for chunk in chunks[:100]])  # Test with first 100
+    # HNSW graph construction inserts in parallel on all configured OpenMP threads
+    num_threads = set_faiss_threads(config)
+    vector_store = FAISSVectorStore(resolve_embedding_device(config))
+    # All test chunks go to the store in one call so they are embedded in batches
+    # of embeddings.batch_size rather than one at a time
+    vector_store.build_index_from_chunks(chunk_dicts[:100])  # Test with first 100
     
     print(f"✓ Successfully built FAISS index")
-    print(f"  - Total vectors: {vector_store.index.ntotal}")
+    print(f"  - Total vectors: {vector_store.index.ntotal} ({num_threads} FAISS threads)")
     
     # Test search
     results = vector_store.search("What are data subject rights?", top_k=3)
@@ -128,11 +134,11 @@ except Exception as e:
 # Test 6: Test RAG system
 print("\nTest 6: Testing RAG system...")
 try:
-    from rag.gdpr_rag import GDPRRAGSystem
+    from src.rag.gdpr_rag import GDPRRAGSystem
     
     # Load the test index we just created
     rag = GDPRRAGSystem(config)
-    rag.vector_store.load_index(Path("vectorstore/test_index"))
+    rag.load_index(Path("vectorstore/test_index"))
     
     query = "What are the main principles of GDPR?"
     result = rag.query(query, top_k=2)
@@ -151,10 +157,10 @@ except Exception as e:
 # Test 7: Test violation finder
 print("\nTest 7: Testing violation finder...")
 try:
-    from violation_finder.violation_finder import GDPRViolationFinder
+    from src.violation_finder.violation_finder import GDPRViolationFinder
     
     finder = GDPRViolationFinder(config)
-    finder.rag_system.vector_store.load_index(Path("vectorstore/test_index"))
+    finder.rag_system.load_index(Path("vectorstore/test_index"))
     
     scenario = "We collect user emails without consent for marketing purposes."
     assessment = finder.analyze_scenario(scenario)
@@ -7,6 +7,9 @@ from typing import List, Dict, Optional
 import yaml
 from pathlib import Path
 
+# libyaml-backed loader when PyYAML was built with it (same safe semantics, parsed in C)
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class OllamaConfig(BaseSettings):
     base_url: str = "http://localhost:11434"
@@ -29,6 +32,9 @@ class FAISSConfig(BaseSettings):
     hnsw_m: int = 32
     hnsw_ef_construction: int = 200
     hnsw_ef_search: int = 128
+    parallel_mode: int = 2
+    nprobe: int = 16
+    omp_num_threads: Optional[int] = None
     store_path: str = "vectorstore/gdpr_faiss_index"
 
 
@@ -57,7 +63,7 @@ class Config:
     def _load_config(self):
         """Load configuration from YAML file"""
         with open(self.config_path, 'r') as f:
-            config_dict = yaml.safe_load(f)
+            config_dict = yaml.load(f, Loader=YAML_LOADER)
         
         self.ollama = OllamaConfig(**config_dict.get('ollama', {}))
         self.embeddings = EmbeddingsConfig(**config_dict.get('embeddings', {}))
@@ -2,26 +2,43 @@
 EDPB (European Data Protection Board) Data Collector
 Fetches guidelines, recommendations, and opinions
 """
-import requests
-from bs4 import BeautifulSoup
-import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional
 from loguru import logger
 import time
 import re
 
+from .http_session import RateLimiter, create_session
+from .storage import BackgroundWriter, write_json, jsonl_line
+
+HEADING_TAGS = {'h1', 'h2', 'h3', 'h4', 'h5'}
+CONTENT_TAGS = {'p', 'ul', 'ol', 'div'}
+
+# Guideline links, matched case-insensitively without lowercasing each href/text
+_GUIDELINE_RE = re.compile(r'guideline', re.I)
+
+# Filename sanitizing for saved guidelines
+_SANITIZE_STRIP = re.compile(r'[^\w\s-]')
+_SANITIZE_JOIN = re.compile(r'[-\s]+')
+
 
 class EDPBCollector:
     """Collector for EDPB guidelines and documents"""
     
-    def __init__(self, output_dir: str = "data/raw/edpb"):
+    def __init__(self, output_dir: str = "data/raw/edpb", http_cache: bool = True):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
         self.base_url = "https://www.edpb.europa.eu"
         self.guidelines_url = f"{self.base_url}/our-work-tools/our-documents/guidelines_en"
         self.sme_guide_url = f"{self.base_url}/sme-data-protection-guide_en"
+        
+        self.session = create_session(str(self.output_dir / ".http_cache") if http_cache else None)
+        # Be respectful to the server: at most one guideline page every 2s across all workers
+        self.rate_limiter = RateLimiter(requests_per_second=0.5)
+        self.writer = BackgroundWriter()
     
     def fetch_guidelines_list(self) -> List[Dict]:
         """
@@ -30,12 +47,16 @@ class EDPBCollector:
         Returns:
             List of guideline metadata
         """
+        # Imported here so loading this module does not pull in requests/bs4
+        import requests
+        from bs4 import BeautifulSoup
+        
         try:
             logger.info("Fetching EDPB guidelines list...")
-            response = requests.get(self.guidelines_url, timeout=30)
+            response = self.session.get(self.guidelines_url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, 'lxml')
             
             guidelines = []
             
@@ -46,7 +67,7 @@ class EDPBCollector:
                 text = link.get_text(strip=True)
                 
                 # Look for guideline documents
-                if 'guideline' in href.lower() or 'guidelines' in text.lower():
+                if _GUIDELINE_RE.search(href) or _GUIDELINE_RE.search(text):
                     full_url = href if href.startswith('http') else f"{self.base_url}{href}"
                     
                     guidelines.append({
@@ -72,12 +93,15 @@ class EDPBCollector:
         Returns:
             Dictionary containing guideline content and metadata
         """
+        import requests
+        from bs4 import BeautifulSoup
+        
         try:
             logger.info(f"Fetching guideline from {url}...")
-            response = requests.get(url, timeout=30)
+            response = self.session.get(url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, 'lxml')
             
             # Extract title
             title_tag = soup.find('h1') or soup.find('title')
@@ -135,23 +159,20 @@ class EDPBCollector:
         sections = []
         
         # Find all headers
-        for heading in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5']):
+        for heading in soup.find_all(HEADING_TAGS):
             section_title = heading.get_text(strip=True)
             
-            # Get content until next heading
+            # Get content until next heading (plain forward walk over the siblings;
+            # find_next_sibling() re-runs a tag search for every step)
             content_parts = []
-            current = heading.find_next_sibling()
-            
-            while current:
-                if current.name in ['h1', 'h2', 'h3', 'h4', 'h5']:
+            for current in heading.next_siblings:
+                if current.name in HEADING_TAGS:
                     break
                 
-                if current.name in ['p', 'ul', 'ol', 'div']:
+                if current.name in CONTENT_TAGS:
                     text = current.get_text(strip=True)
                     if text:
                         content_parts.append(text)
-                
-                current = current.find_next_sibling()
             
             if content_parts:
                 sections.append({
@@ -169,12 +190,15 @@ class EDPBCollector:
         Returns:
             Dictionary containing the guide content
         """
+        import requests
+        from bs4 import BeautifulSoup
+        
         try:
             logger.info("Fetching EDPB SME Guide...")
-            response = requests.get(self.sme_guide_url, timeout=30)
+            response = self.session.get(self.sme_guide_url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, 'lxml')
             
             # Extract content
             content_div = soup.find('div', {'class': 'content'}) or soup.find('main')
@@ -201,8 +225,7 @@ class EDPBCollector:
             
             # Save to file
             output_file = self.output_dir / "sme_guide.json"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(document, f, ensure_ascii=False, indent=2)
+            write_json(output_file, document)
             
             logger.info(f"Saved SME guide to {output_file}")
             return document
@@ -211,12 +234,23 @@ class EDPBCollector:
             logger.error(f"Error fetching SME guide: {e}")
             return None
     
-    def fetch_all_guidelines(self, limit: Optional[int] = None) -> List[Dict]:
+    def fetch_all_guidelines(
+        self,
+        limit: Optional[int] = None,
+        max_workers: int = 4,
+        split_files: bool = False
+    ) -> List[Dict]:
         """
         Fetch all EDPB guidelines
         
+        Guidelines are written to a single guidelines.jsonl file (one compact
+        document per line) so loaders read one sequential file.
+        
         Args:
             limit: Maximum number of guidelines to fetch (None for all)
+            max_workers: Number of guideline pages fetched concurrently
+            split_files: Write one indented JSON file per guideline instead
+                (easier to inspect when debugging the scraper)
         
         Returns:
             List of guideline documents
@@ -226,29 +260,64 @@ class EDPBCollector:
         if limit:
             guidelines_list = guidelines_list[:limit]
         
-        documents = []
+        total = len(guidelines_list)
         
-        for i, guideline_info in enumerate(guidelines_list, 1):
-            logger.info(f"Fetching guideline {i}/{len(guidelines_list)}: {guideline_info['title']}")
+        # Fetch on a small bounded pool; map() keeps the original order
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            documents = executor.map(
+                lambda item: self._fetch_and_save_guideline(item[0], total, item[1], split_files),
+                enumerate(guidelines_list, 1)
+            )
+            if split_files:
+                documents = [doc for doc in documents if doc]
+                self.writer.wait()
+                # The processor reads .json and .jsonl alike; drop a JSONL left by an earlier run
+                (self.output_dir / "guidelines.jsonl").unlink(missing_ok=True)
+                return documents
             
-            doc = self.fetch_guideline_content(guideline_info['url'])
+            # Lines are appended from this thread as results arrive, in order;
+            # the file only replaces the previous one once it is complete
+            output_file = self.output_dir / "guidelines.jsonl"
+            tmp_file = output_file.with_name(output_file.name + ".tmp")
+            results = []
+            with open(tmp_file, 'wb') as f:
+                for doc in documents:
+                    if doc:
+                        f.write(jsonl_line(doc))
+                        results.append(doc)
+            os.replace(tmp_file, output_file)
             
-            if doc:
-                documents.append(doc)
-                
-                # Save individual guideline
-                safe_filename = re.sub(r'[^\w\s-]', '', guideline_info['title'])[:100]
-                safe_filename = re.sub(r'[-\s]+', '_', safe_filename).lower()
-                output_file = self.output_dir / f"guideline_{i}_{safe_filename}.json"
-                
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(doc, f, ensure_ascii=False, indent=2)
-                
-                logger.info(f"Saved to {output_file}")
+            # Per-guideline files from earlier split_files runs would duplicate the JSONL
+            for stale_file in self.output_dir.glob("guideline_*.json"):
+                stale_file.unlink()
+            
+            logger.info(f"Saved {len(results)} guidelines to {output_file}")
+            return results
+    
+    def _fetch_and_save_guideline(
+        self,
+        i: int,
+        total: int,
+        guideline_info: Dict,
+        split_files: bool = False
+    ) -> Optional[Dict]:
+        """Fetch one guideline, saving it to its own JSON file if split_files is set"""
+        logger.info(f"Fetching guideline {i}/{total}: {guideline_info['title']}")
+        
+        self.rate_limiter.wait()
+        doc = self.fetch_guideline_content(guideline_info['url'])
+        
+        if doc and split_files:
+            # Save individual guideline
+            safe_filename = _SANITIZE_STRIP.sub('', guideline_info['title'])[:100]
+            safe_filename = _SANITIZE_JOIN.sub('_', safe_filename).lower()
+            output_file = self.output_dir / f"guideline_{i}_{safe_filename}.json"
+            
+            self.writer.write_json(output_file, doc)
             
-            time.sleep(2)  # Be respectful to the server
+            logger.info(f"Saving to {output_file}")
         
-        return documents
+        return doc
 
 
 if __name__ == "__main__":
@@ -3,25 +3,93 @@ EUR-Lex GDPR Data Collector
 Fetches GDPR regulation text in multiple languages
 """
 import requests
-from bs4 import BeautifulSoup
-import json
+from concurrent.futures import ThreadPoolExecutor
+import lxml.html
+from lxml import etree
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from loguru import logger
 import time
 import re
 
+from .http_session import RateLimiter, create_session
+from .storage import BackgroundWriter, is_fresh, read_json, write_json
+
+# XPath expressions compiled once at import (document order, descendants only)
+_MAIN_CONTENT_BY_ID = etree.XPath("//div[@id='text']")
+_MAIN_CONTENT_BY_CLASS = etree.XPath(
+    "//div[contains(concat(' ', normalize-space(@class), ' '), ' eli-main-content ')]"
+)
+
+# Tags that may carry an article, recital or chapter marker
+STRUCTURE_TAGS = frozenset({'p', 'div', 'h1', 'h2', 'h3', 'h4'})
+
+# Structure markers; recitals start with "(n)", articles and chapters may appear anywhere
+ARTICLE_RE = re.compile(r'Article\s+(\d+)', re.IGNORECASE)
+RECITAL_RE = re.compile(r'\((\d+)\)')
+CHAPTER_RE = re.compile(r'CHAPTER\s+([IVX]+)', re.IGNORECASE)
+
+
+def _collect_text(root) -> Tuple[List[str], Dict]:
+    """
+    Walk an lxml tree once, collecting its text fragments
+    
+    Returns:
+        Tuple of (fragments, texts): the stripped, non-empty strings that
+        itertext() yields, in document order, and the text of every
+        descendant structure tag (in document order), i.e. the concatenation
+        of the fragments inside it, as BeautifulSoup's get_text(strip=True)
+    """
+    parts = []
+    texts = {}
+    
+    def add(text):
+        if text:
+            text = text.strip()
+            if text:
+                parts.append(text)
+    
+    def walk(element):
+        is_candidate = element.tag in STRUCTURE_TAGS and element is not root
+        if is_candidate:
+            texts[element] = None  # reserve the slot in document order
+        start = len(parts)
+        add(element.text)
+        for child in element:
+            if isinstance(child.tag, str):  # comments/PIs contribute only their tail
+                walk(child)
+            add(child.tail)
+        if is_candidate:
+            texts[element] = "".join(parts[start:])
+    
+    walk(root)
+    return parts, texts
+
 
 class EURLexCollector:
     """Collector for EUR-Lex GDPR regulation data"""
     
-    def __init__(self, output_dir: str = "data/raw/eur_lex"):
+    def __init__(
+        self,
+        output_dir: str = "data/raw/eur_lex",
+        http_cache: bool = True,
+        cache_ttl_seconds: float = 7 * 24 * 3600
+    ):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Saved documents younger than this are reused instead of re-fetched
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.writer = BackgroundWriter()
         
         # CELEX number for GDPR
         self.celex = "32016R0679"
         self.base_url = "https://eur-lex.europa.eu/legal-content"
+        self.session = create_session(str(self.output_dir / ".http_cache") if http_cache else None)
+        # A requests-cache session reads the whole body before returning, so
+        # responses are only streamed into the parser on a plain session
+        self.stream_responses = not hasattr(self.session, "cache")
+        # Be respectful to the server: at most one page every 2s across all workers
+        self.rate_limiter = RateLimiter(requests_per_second=0.5)
         
         # Language codes
         self.languages = {
@@ -37,12 +105,20 @@ class EURLexCollector:
             "SV": "Swedish"
         }
     
-    def fetch_gdpr_text(self, language: str = "EN") -> Optional[Dict]:
+    def fetch_gdpr_text(
+        self,
+        language: str = "EN",
+        force_refresh: bool = False,
+        background_write: bool = False
+    ) -> Optional[Dict]:
         """
         Fetch GDPR text in specified language
         
         Args:
             language: Two-letter language code (e.g., 'EN', 'DE')
+            force_refresh: Re-fetch even if a recent saved copy exists
+            background_write: Queue the save on self.writer instead of writing
+                before returning (the caller must then call self.writer.wait())
         
         Returns:
             Dictionary containing the full text and metadata
@@ -51,29 +127,45 @@ class EURLexCollector:
             logger.error(f"Unsupported language: {language}")
             return None
         
+        output_file = self.output_dir / f"gdpr_{language.lower()}.json"
+        if not force_refresh and is_fresh(output_file, self.cache_ttl_seconds):
+            logger.info(f"Using saved GDPR text in {self.languages[language]} from {output_file}")
+            return read_json(output_file)
+        
         url = f"{self.base_url}/{language}/TXT/HTML/?uri=CELEX:{self.celex}"
         
         try:
             logger.info(f"Fetching GDPR text in {self.languages[language]}...")
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
+            self.rate_limiter.wait()
+            with self.session.get(url, timeout=30, stream=self.stream_responses) as response:
+                response.raise_for_status()
+                
+                if self.stream_responses:
+                    # Feed the (decompressed) body straight into the parser, so the
+                    # page is never held as one bytes object next to the tree
+                    response.raw.decode_content = True
+                    tree = lxml.html.parse(response.raw).getroot()
+                elif response.content:
+                    tree = lxml.html.document_fromstring(response.content)
+                else:
+                    tree = None
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            if tree is None:
+                logger.error(f"Empty response for GDPR text in {self.languages[language]}")
+                return None
             
             # Extract main content
-            content_div = soup.find('div', {'id': 'text'}) or soup.find('div', {'class': 'eli-main-content'})
+            matches = _MAIN_CONTENT_BY_ID(tree) or _MAIN_CONTENT_BY_CLASS(tree)
+            content_div = matches[0] if matches else None
             
-            if not content_div:
+            if content_div is None:
                 logger.warning("Could not find main content div")
-                content_div = soup.find('body')
-            
-            # Extract structured content
-            articles = self._extract_articles(content_div)
-            recitals = self._extract_recitals(content_div)
-            chapters = self._extract_chapters(content_div)
+                content_div = tree.find('body')
+                if content_div is None:
+                    content_div = tree
             
-            # Get full text
-            full_text = content_div.get_text(separator='\n', strip=True) if content_div else ""
+            # Extract full text and structured content
+            full_text, articles, recitals, chapters = self._extract_structure(content_div)
             
             document = {
                 "source": "EUR-Lex",
@@ -93,12 +185,13 @@ class EURLexCollector:
                 }
             }
             
-            # Save to file
-            output_file = self.output_dir / f"gdpr_{language.lower()}.json"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(document, f, ensure_ascii=False, indent=2)
+            # Save to file (in the background when the caller waits on self.writer)
+            if background_write:
+                self.writer.write_json(output_file, document)
+            else:
+                write_json(output_file, document)
             
-            logger.info(f"Saved GDPR text to {output_file}")
+            logger.info(f"Saving GDPR text to {output_file}")
             logger.info(f"Articles: {len(articles)}, Recitals: {len(recitals)}, Chapters: {len(chapters)}")
             
             return document
@@ -107,95 +200,77 @@ class EURLexCollector:
             logger.error(f"Error fetching GDPR text: {e}")
             return None
     
-    def _extract_articles(self, soup) -> List[Dict]:
-        """Extract individual articles from the document"""
+    def _extract_structure(self, root) -> Tuple[str, List[Dict], List[Dict], List[Dict]]:
+        """
+        Extract full text, articles, recitals and chapters in one pass
+        
+        A single tree walk yields the full text and every candidate tag's text;
+        each candidate is then classified against all three patterns.
+        
+        Returns:
+            Tuple of (full_text, articles, recitals, chapters)
+        """
         articles = []
+        recitals = []
+        chapters = []
         
-        # Look for article patterns
-        article_pattern = re.compile(r'Article\s+(\d+)', re.IGNORECASE)
+        parts, texts = _collect_text(root)
         
-        # Find all potential article headers
-        for tag in soup.find_all(['p', 'div', 'h1', 'h2', 'h3', 'h4']):
-            text = tag.get_text(strip=True)
-            match = article_pattern.search(text)
+        for tag, text in texts.items():
+            name = tag.tag
             
+            # Articles: any candidate mentioning "Article n"
+            match = ARTICLE_RE.search(text)
             if match:
-                article_num = match.group(1)
-                
-                # Extract article title (text after article number)
-                title = text[match.end():].strip()
-                
-                # Get content (next siblings until next article)
+                # Content is the following p/div siblings up to the next article
                 content_parts = []
-                current = tag.find_next_sibling()
-                
-                while current:
-                    if current.name in ['p', 'div']:
-                        sibling_text = current.get_text(strip=True)
-                        if article_pattern.search(sibling_text):
+                for current in tag.itersiblings():
+                    if current.tag in ('p', 'div'):
+                        sibling_text = texts[current]
+                        if ARTICLE_RE.search(sibling_text):
                             break
                         if sibling_text:
                             content_parts.append(sibling_text)
-                    current = current.find_next_sibling()
                 
                 articles.append({
-                    "number": article_num,
-                    "title": title,
+                    "number": match.group(1),
+                    "title": text[match.end():].strip(),
                     "content": "\n".join(content_parts)
                 })
-        
-        return articles
-    
-    def _extract_recitals(self, soup) -> List[Dict]:
-        """Extract recitals from the document"""
-        recitals = []
-        
-        # Recitals typically appear before Article 1
-        recital_pattern = re.compile(r'\((\d+)\)')
-        
-        for tag in soup.find_all(['p', 'div']):
-            text = tag.get_text(strip=True)
             
-            # Check if this starts with a recital number
-            match = recital_pattern.match(text)
-            if match:
-                recital_num = match.group(1)
-                content = text[match.end():].strip()
-                
-                recitals.append({
-                    "number": recital_num,
-                    "content": content
-                })
-        
-        return recitals
-    
-    def _extract_chapters(self, soup) -> List[Dict]:
-        """Extract chapter structure"""
-        chapters = []
-        
-        chapter_pattern = re.compile(r'CHAPTER\s+([IVX]+)', re.IGNORECASE)
-        
-        for tag in soup.find_all(['h1', 'h2', 'h3', 'p']):
-            text = tag.get_text(strip=True)
-            match = chapter_pattern.search(text)
+            # Recitals (typically before Article 1): p/div starting with "(n)"
+            if name in ('p', 'div'):
+                match = RECITAL_RE.match(text)
+                if match:
+                    recitals.append({
+                        "number": match.group(1),
+                        "content": text[match.end():].strip()
+                    })
             
-            if match:
-                chapter_num = match.group(1)
-                title = text[match.end():].strip()
-                
-                chapters.append({
-                    "number": chapter_num,
-                    "title": title
-                })
+            # Chapters: h1-h3/p mentioning "CHAPTER <roman>"
+            if name in ('h1', 'h2', 'h3', 'p'):
+                match = CHAPTER_RE.search(text)
+                if match:
+                    chapters.append({
+                        "number": match.group(1),
+                        "title": text[match.end():].strip()
+                    })
         
-        return chapters
+        return "\n".join(parts), articles, recitals, chapters
     
-    def fetch_all_languages(self, languages: Optional[List[str]] = None) -> List[Dict]:
+    def fetch_all_languages(
+        self,
+        languages: Optional[List[str]] = None,
+        max_workers: int = 3,
+        force_refresh: bool = False
+    ) -> List[Dict]:
         """
         Fetch GDPR text in multiple languages
         
         Args:
             languages: List of language codes. If None, fetches all available languages
+            max_workers: Number of languages fetched concurrently
+            force_refresh: Re-fetch languages even if recent saved copies exist
         
         Returns:
             List of document dictionaries
@@ -203,15 +278,22 @@ class EURLexCollector:
         if languages is None:
             languages = list(self.languages.keys())
         
-        documents = []
-        for lang in languages:
-            logger.info(f"Fetching {lang}...")
-            doc = self.fetch_gdpr_text(lang)
-            if doc:
-                documents.append(doc)
-            time.sleep(2)  # Be respectful to the server
+        # Downloads overlap on a small pool (at most max_workers requests in flight
+        # to EUR-Lex); map() keeps the requested language order
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            documents = executor.map(
+                lambda language: self._fetch_language(language, force_refresh),
+                languages
+            )
+            documents = [doc for doc in documents if doc]
         
+        self.writer.wait()
         return documents
+    
+    def _fetch_language(self, language: str, force_refresh: bool = False) -> Optional[Dict]:
+        """Fetch and save the GDPR text for one language"""
+        logger.info(f"Fetching {language}...")
+        return self.fetch_gdpr_text(language, force_refresh, background_write=True)
 
 
 if __name__ == "__main__":
@@ -2,25 +2,49 @@
 GDPRhub Data Collector
 Fetches GDPR case law from GDPRhub
 """
-import requests
-from bs4 import BeautifulSoup
-import json
+import os
+import lxml.html
+from lxml import etree
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional
 from loguru import logger
 import time
-import re
+
+from .http_session import RateLimiter, create_session
+from .storage import BackgroundWriter, is_fresh, read_json, write_json
+
+SECTION_HEADINGS = frozenset({'h2', 'h3', 'h4'})
+SECTION_CONTENT = frozenset({'p', 'ul', 'ol', 'div'})
+
+_INFOBOX = etree.XPath("//table[contains(concat(' ', normalize-space(@class), ' '), ' infobox ')]")
+
+
+def _node_text(node, separator: str = "") -> str:
+    """Stripped text of an lxml element, like BeautifulSoup's get_text(separator, strip=True)"""
+    return separator.join(text for text in (part.strip() for part in node.itertext()) if text)
 
 
 class GDPRhubCollector:
     """Collector for GDPRhub case law"""
     
-    def __init__(self, output_dir: str = "data/raw/gdprhub"):
+    def __init__(
+        self,
+        output_dir: str = "data/raw/gdprhub",
+        http_cache: bool = True,
+        cache_ttl_seconds: float = 7 * 24 * 3600
+    ):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Saved cases younger than this are reused instead of re-fetched
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.writer = BackgroundWriter()
         
         self.base_url = "https://gdprhub.eu"
         self.api_url = f"{self.base_url}/api.php"
+        self.session = create_session(str(self.output_dir / ".http_cache") if http_cache else None)
+        # Be respectful to the server: at most one case every 2s across all workers
+        self.rate_limiter = RateLimiter(requests_per_second=0.5)
     
     def fetch_case_list(self, limit: int = 100) -> List[Dict]:
         """
@@ -44,7 +68,7 @@ class GDPRhubCollector:
                 "format": "json"
             }
             
-            response = requests.get(self.api_url, params=params, timeout=30)
+            response = self.session.get(self.api_url, params=params, timeout=30)
             response.raise_for_status()
             
             data = response.json()
@@ -78,15 +102,16 @@ class GDPRhubCollector:
         try:
             logger.info(f"Fetching case: {case_info['title']}")
             
-            # Fetch page content using MediaWiki API
+            # Fetch rendered page content using MediaWiki API (sections are
+            # recovered from the HTML, so the section index is not requested)
             params = {
                 "action": "parse",
                 "pageid": case_info["pageid"],
                 "format": "json",
-                "prop": "text|categories|sections"
+                "prop": "text|categories"
             }
             
-            response = requests.get(self.api_url, params=params, timeout=30)
+            response = self.session.get(self.api_url, params=params, timeout=30)
             response.raise_for_status()
             
             data = response.json()
@@ -97,7 +122,11 @@ class GDPRhubCollector:
             parse_data = data["parse"]
             html_content = parse_data.get("text", {}).get("*", "")
             
-            soup = BeautifulSoup(html_content, 'html.parser')
+            # MediaWiki returns an HTML fragment; lxml wraps it in html/body
+            if html_content.strip():
+                root = lxml.html.document_fromstring(html_content)
+            else:
+                root = lxml.html.Element('html')
             
             # Extract case information
             case_data = {
@@ -106,7 +135,7 @@ class GDPRhubCollector:
                 "title": case_info["title"],
                 "url": case_info["url"],
                 "pageid": case_info["pageid"],
-                "full_text": soup.get_text(separator='\n', strip=True),
+                "full_text": _node_text(root, '\n'),
                 "sections": [],
                 "metadata": {
                     "fetch_date": time.strftime("%Y-%m-%d"),
@@ -115,8 +144,8 @@ class GDPRhubCollector:
             }
             
             # Extract structured information
-            case_data["case_details"] = self._extract_case_details(soup)
-            case_data["sections"] = self._extract_sections(soup)
+            case_data["case_details"] = self._extract_case_details(root)
+            case_data["sections"] = self._extract_sections(root)
             
             return case_data
             
@@ -124,99 +153,144 @@ class GDPRhubCollector:
             logger.error(f"Error fetching case content: {e}")
             return None
     
-    def _extract_case_details(self, soup) -> Dict:
+    def _extract_case_details(self, root) -> Dict:
         """Extract structured case details from infobox"""
         details = {}
         
         # Look for infobox table
-        infobox = soup.find('table', {'class': 'infobox'})
+        infoboxes = _INFOBOX(root)
         
-        if infobox:
-            for row in infobox.find_all('tr'):
-                cells = row.find_all(['th', 'td'])
+        if infoboxes:
+            for row in infoboxes[0].iter('tr'):
+                cells = list(row.iter('th', 'td'))
                 if len(cells) == 2:
-                    key = cells[0].get_text(strip=True)
-                    value = cells[1].get_text(strip=True)
+                    key = _node_text(cells[0])
+                    value = _node_text(cells[1])
                     details[key] = value
         
         return details
     
-    def _extract_sections(self, soup) -> List[Dict]:
+    def _extract_sections(self, root) -> List[Dict]:
         """Extract sections from case"""
         sections = []
         
-        for heading in soup.find_all(['h2', 'h3', 'h4']):
-            section_title = heading.get_text(strip=True)
+        for heading in root.iter('h2', 'h3', 'h4'):
+            section_title = _node_text(heading)
             
-            # Get content until next heading
+            # Get content until next heading (getnext() is a single C call per step)
             content_parts = []
-            current = heading.find_next_sibling()
+            current = heading.getnext()
             
-            while current:
-                if current.name in ['h2', 'h3', 'h4']:
-                    break
-                
-                if current.name in ['p', 'ul', 'ol', 'div']:
-                    text = current.get_text(strip=True)
+            while current is not None and current.tag not in SECTION_HEADINGS:
+                if current.tag in SECTION_CONTENT:
+                    text = _node_text(current)
                     if text:
                         content_parts.append(text)
                 
-                current = current.find_next_sibling()
+                current = current.getnext()
             
             if content_parts:
                 sections.append({
                     "title": section_title,
                     "content": "\n".join(content_parts),
-                    "level": heading.name
+                    "level": heading.tag
                 })
         
         return sections
     
-    def fetch_all_cases(self, limit: int = 50) -> List[Dict]:
+    def fetch_all_cases(self, limit: int = 50, max_workers: int = 4, force_refresh: bool = False) -> List[Dict]:
         """
         Fetch multiple GDPR cases
         
         Args:
             limit: Maximum number of cases to fetch
+            max_workers: Number of cases fetched concurrently
+            force_refresh: Re-fetch cases even if recent saved copies exist
         
         Returns:
             List of case documents
         """
-        case_list = self.fetch_case_list(limit=limit)
+        self._migrate_legacy_case_files()
         
-        documents = []
+        case_list = self.fetch_case_list(limit=limit)
+        total = len(case_list)
         
-        for i, case_info in enumerate(case_list, 1):
-            logger.info(f"Fetching case {i}/{len(case_list)}")
-            
-            case_doc = self.fetch_case_content(case_info)
-            
-            if case_doc:
-                documents.append(case_doc)
-                
-                # Save individual case
-                safe_filename = re.sub(r'[^\w\s-]', '', case_info['title'])[:100]
-                safe_filename = re.sub(r'[-\s]+', '_', safe_filename).lower()
-                output_file = self.output_dir / f"case_{i}_{safe_filename}.json"
-                
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(case_doc, f, ensure_ascii=False, indent=2)
-                
-                logger.info(f"Saved to {output_file}")
-            
-            time.sleep(2)  # Be respectful to the server
+        # Fetch on a small bounded pool; map() keeps the original order
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            documents = executor.map(
+                lambda item: self._fetch_and_save_case(item[0], total, item[1], force_refresh),
+                enumerate(case_list, 1)
+            )
+            documents = [doc for doc in documents if doc]
+        self.writer.wait()
         
         # Save summary
         summary_file = self.output_dir / "cases_summary.json"
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                "total_cases": len(documents),
-                "fetch_date": time.strftime("%Y-%m-%d"),
-                "cases": [{"title": d["title"], "url": d["url"]} for d in documents]
-            }, f, ensure_ascii=False, indent=2)
+        write_json(summary_file, {
+            "total_cases": len(documents),
+            "fetch_date": time.strftime("%Y-%m-%d"),
+            "cases": [{"title": d["title"], "url": d["url"]} for d in documents]
+        })
         
         logger.info(f"Fetched {len(documents)} cases total")
         return documents
+    
+    def _migrate_legacy_case_files(self) -> None:
+        """
+        Rename cases saved as case_<i>_<title>.json to the case_<pageid>.json naming
+        
+        Old files duplicating an already saved case are removed, so the document
+        processor (which reads every case_*.json) sees each case once. Renaming
+        keeps the file's mtime, so migrated copies are still reused while fresh.
+        """
+        migrated = 0
+        for path in self.output_dir.glob("case_*_*.json"):
+            try:
+                pageid = read_json(path).get("pageid")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read legacy case file {path}: {e}")
+                continue
+            if pageid is None:
+                logger.warning(f"Legacy case file {path} has no pageid; left in place")
+                continue
+            
+            new_path = self.output_dir / f"case_{pageid}.json"
+            if new_path.exists():
+                path.unlink()
+            else:
+                os.replace(path, new_path)
+            migrated += 1
+        
+        if migrated:
+            logger.info(f"Migrated {migrated} case files to the case_<pageid>.json naming")
+    
+    def _fetch_and_save_case(
+        self,
+        i: int,
+        total: int,
+        case_info: Dict,
+        force_refresh: bool = False
+    ) -> Optional[Dict]:
+        """Fetch one case and save it to its own JSON file (reusing a recent saved copy)"""
+        # Named by pageid: stable across runs and title renames (the title is in the JSON)
+        output_file = self.output_dir / f"case_{case_info['pageid']}.json"
+        
+        if not force_refresh and is_fresh(output_file, self.cache_ttl_seconds):
+            logger.info(f"Using saved case {i}/{total} from {output_file}")
+            return read_json(output_file)
+        
+        logger.info(f"Fetching case {i}/{total}")
+        
+        self.rate_limiter.wait()
+        case_doc = self.fetch_case_content(case_info)
+        
+        if case_doc:
+            # Save individual case (in the background, overlapping the next fetch)
+            self.writer.write_json(output_file, case_doc)
+            
+            logger.info(f"Saving to {output_file}")
+        
+        return case_doc
 
 
 if __name__ == "__main__":
@@ -0,0 +1,85 @@
+"""
+Shared HTTP session setup and request rate limiting for the data collectors
+"""
+import threading
+import time
+from datetime import timedelta
+from typing import Optional
+from loguru import logger
+
+
+def create_session(cache_name: Optional[str] = None):
+    """
+    Create a pooled HTTP session (keep-alive, compression, retries on transient errors)
+
+    Advertises every content encoding urllib3 can decode in this
+    environment: gzip and deflate always, br when brotli is installed.
+
+    With a cache_name and requests-cache installed, responses are kept in a
+    SQLite cache at that path (for 7 days unless the server's Cache-Control
+    says otherwise) and revalidated with conditional If-None-Match /
+    If-Modified-Since requests, so repeated collection runs skip the
+    network or at least the response body.
+
+    Args:
+        cache_name: Path of the SQLite response cache (None disables caching)
+
+    Returns:
+        A requests.Session (or requests_cache.CachedSession)
+    """
+    # Imported here so loading a collector module does not pull in requests
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.request import ACCEPT_ENCODING
+    from urllib3.util.retry import Retry
+
+    session = None
+    if cache_name:
+        try:
+            from requests_cache import CachedSession
+            session = CachedSession(
+                cache_name=cache_name,
+                backend="sqlite",
+                expire_after=timedelta(days=7),
+                cache_control=True,
+                stale_if_error=True
+            )
+        except ImportError:
+            logger.debug("requests-cache not installed; responses will not be cached")
+    if session is None:
+        session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({
+        "Accept-Encoding": ACCEPT_ENCODING,
+        "User-Agent": "gdpr-rag-collector/1.0"
+    })
+    return session
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter enforcing a minimum interval between requests
+
+    Only sleeps for whatever is left of the interval, so slow responses are
+    not penalised with a fixed delay on top. Safe to share between threads.
+    """
+
+    def __init__(self, requests_per_second: float):
+        self.min_interval = 1.0 / requests_per_second
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block until the next request may be sent"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
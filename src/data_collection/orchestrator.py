@@ -2,20 +2,16 @@
 Data collection orchestrator
 Coordinates all data collection from different sources
 """
-import sys
 from pathlib import Path
-
-# Add parent directory to path
-sys.path.append(str(Path(__file__).parent.parent))
-
 from loguru import logger
 from typing import Dict, List
-import json
+from concurrent.futures import ThreadPoolExecutor
 import time
 
-from data_collection.eur_lex_collector import EURLexCollector
-from data_collection.edpb_collector import EDPBCollector
-from data_collection.gdprhub_collector import GDPRhubCollector
+from .eur_lex_collector import EURLexCollector
+from .edpb_collector import EDPBCollector
+from .gdprhub_collector import GDPRhubCollector
+from .storage import write_json
 
 
 class DataCollectionOrchestrator:
@@ -37,21 +33,50 @@ class DataCollectionOrchestrator:
         Returns:
             Dictionary with collected documents by source
         """
-        results = {}
-        
         logger.info("Starting comprehensive data collection...")
         
-        # Collect EUR-Lex GDPR text
+        # The sources live on unrelated hosts, so each one is collected on its
+        # own thread; the two EDPB jobs share a host and run one after the other
+        jobs = {}
         if self.data_sources.get('eur_lex', {}).get('enabled', True):
-            logger.info("\n=== Collecting EUR-Lex GDPR Regulation ===")
-            languages = self.data_sources.get('eur_lex', {}).get('languages', ['EN'])
-            results['eur_lex'] = self.eur_lex.fetch_all_languages(languages)
-            logger.info(f"Collected {len(results['eur_lex'])} GDPR documents")
+            jobs['eur_lex'] = self._collect_eur_lex
+        if (self.data_sources.get('edpb_guidelines', {}).get('enabled', True) or
+                self.data_sources.get('edpb_sme_guide', {}).get('enabled', True)):
+            jobs['edpb'] = self._collect_edpb
+        if self.data_sources.get('gdprhub', {}).get('enabled', True):
+            jobs['gdprhub_cases'] = self._collect_gdprhub
+        
+        results = {}
+        if jobs:
+            with ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="collect") as executor:
+                futures = [executor.submit(job) for job in jobs.values()]
+                for future in futures:
+                    results.update(future.result())
+        
+        # Save collection summary
+        self._save_collection_summary(results)
+        
+        logger.info("\n=== Data Collection Complete ===")
+        logger.info(f"Total documents collected: {sum(len(v) for v in results.values())}")
+        
+        return results
+    
+    def _collect_eur_lex(self) -> Dict[str, List]:
+        """Collect EUR-Lex GDPR text"""
+        logger.info("\n=== Collecting EUR-Lex GDPR Regulation ===")
+        languages = self.data_sources.get('eur_lex', {}).get('languages', ['EN'])
+        documents = self.eur_lex.fetch_all_languages(languages)
+        logger.info(f"Collected {len(documents)} GDPR documents")
+        return {'eur_lex': documents}
+    
+    def _collect_edpb(self) -> Dict[str, List]:
+        """Collect EDPB guidelines and the SME guide"""
+        results = {}
         
-        # Collect EDPB materials
         if self.data_sources.get('edpb_guidelines', {}).get('enabled', True):
             logger.info("\n=== Collecting EDPB Guidelines ===")
-            results['edpb_guidelines'] = self.edpb.fetch_all_guidelines(limit=10)
+            split_files = self.data_sources.get('edpb_guidelines', {}).get('split_files', False)
+            results['edpb_guidelines'] = self.edpb.fetch_all_guidelines(limit=10, split_files=split_files)
             logger.info(f"Collected {len(results['edpb_guidelines'])} guidelines")
         
         if self.data_sources.get('edpb_sme_guide', {}).get('enabled', True):
@@ -59,20 +84,15 @@ class DataCollectionOrchestrator:
             sme_guide = self.edpb.fetch_sme_guide()
             results['edpb_sme'] = [sme_guide] if sme_guide else []
         
-        # Collect case law
-        if self.data_sources.get('gdprhub', {}).get('enabled', True):
-            logger.info("\n=== Collecting GDPRhub Case Law ===")
-            results['gdprhub_cases'] = self.gdprhub.fetch_all_cases(limit=20)
-            logger.info(f"Collected {len(results['gdprhub_cases'])} cases")
-        
-        # Save collection summary
-        self._save_collection_summary(results)
-        
-        logger.info("\n=== Data Collection Complete ===")
-        logger.info(f"Total documents collected: {sum(len(v) for v in results.values())}")
-        
         return results
     
+    def _collect_gdprhub(self) -> Dict[str, List]:
+        """Collect GDPRhub case law"""
+        logger.info("\n=== Collecting GDPRhub Case Law ===")
+        documents = self.gdprhub.fetch_all_cases(limit=20)
+        logger.info(f"Collected {len(documents)} cases")
+        return {'gdprhub_cases': documents}
+    
     def _save_collection_summary(self, results: Dict):
         """Save summary of data collection"""
         summary = {
@@ -94,8 +114,7 @@ class DataCollectionOrchestrator:
             }
         
         summary_file = Path("data/raw/collection_summary.json")
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, ensure_ascii=False, indent=2)
+        write_json(summary_file, summary)
         
         logger.info(f"Saved collection summary to {summary_file}")
 
@@ -0,0 +1,84 @@
+"""
+Shared JSON output helpers for the data collectors
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+_write_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="json-writer")
+
+
+def write_json(path: Path, data) -> None:
+    """
+    Write data as indented UTF-8 JSON, using orjson when it is installed
+
+    The file is written next to its destination and moved into place with
+    os.replace, so readers never see a partially written file.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    if orjson is not None:
+        tmp_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+class BackgroundWriter:
+    """
+    Saves JSON files on a background thread so fetch workers can move on
+
+    Writes go through write_json (atomic). Call wait() before anything reads
+    the files back; it re-raises the first write error, if any.
+    """
+
+    def __init__(self):
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def write_json(self, path: Path, data) -> Future:
+        """Queue an atomic write of data to path"""
+        future = _write_executor.submit(write_json, path, data)
+        with self._lock:
+            self._pending.append(future)
+        return future
+
+    def wait(self) -> None:
+        """Block until every queued write has finished"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
+
+def read_json(path: Path):
+    """Load a JSON file written by write_json"""
+    if orjson is not None:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def is_fresh(path: Path, max_age_seconds: float) -> bool:
+    """True if path exists and was modified less than max_age_seconds ago"""
+    try:
+        return time.time() - Path(path).stat().st_mtime < max_age_seconds
+    except FileNotFoundError:
+        return False
+
+
+def jsonl_line(data) -> bytes:
+    """Serialize data as one compact JSON line (UTF-8 bytes, newline-terminated)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+    return (json.dumps(data, ensure_ascii=False) + "\n").encode('utf-8')
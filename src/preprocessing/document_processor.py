@@ -3,11 +3,72 @@ Document Processor
 Handles preprocessing and chunking of collected GDPR documents
 """
 import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from loguru import logger
 import re
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
+
+from ..utils import LRUCache
+
+try:
+    import ahocorasick
+except ImportError:  # _categorize_text falls back to per-category regexes
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:  # stdlib json is used instead
+    orjson = None
+
+# Abbreviations whose trailing period must not end a sentence ("Art.", "No.", "e.g.", "i.e.")
+_ABBREV_RE = re.compile(r'\b(Art|No|e\.g|i\.e)\.\s')
+# Sentence boundary: period/question/exclamation followed by space and a capital or "("
+_SENT_SPLIT_RE = re.compile(r'(?<=[.!?])\s+(?=[A-Z(])')
+
+
+def _parse_json(data: bytes):
+    """Parse UTF-8 JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _load_json(path: Path):
+    """Load a JSON file"""
+    with open(path, 'rb') as f:
+        return _parse_json(f.read())
+
+
+def _dump_json(data, indent: bool = False) -> bytes:
+    """Serialize data to UTF-8 JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    return json.dumps(data, ensure_ascii=False, indent=2 if indent else None).encode('utf-8')
+
+
+@lru_cache(maxsize=8)
+def _compile_keyword_automaton(keyword_masks: Tuple[Tuple[str, int], ...]):
+    """
+    Compile (keyword, category bitmask) pairs into an Aho-Corasick automaton
+
+    Cached per keyword set, so every processor in a process (and every
+    forked worker, which inherits the parent's cache) shares one read-only
+    automaton instead of rebuilding it.
+    """
+    automaton = ahocorasick.Automaton()
+    for keyword, mask in keyword_masks:
+        automaton.add_word(keyword, mask)
+    automaton.make_automaton()
+    return automaton
 
 
 @dataclass
@@ -19,8 +80,18 @@ class DocumentChunk:
     source: str
     document_type: str
     
+    # Declared by hand rather than @dataclass(slots=True), which needs Python 3.10
+    __slots__ = ("text", "metadata", "chunk_id", "source", "document_type")
+    
     def to_dict(self):
-        return asdict(self)
+        # Shallow on purpose: asdict() would deep-copy metadata for every chunk
+        return {
+            "text": self.text,
+            "metadata": self.metadata,
+            "chunk_id": self.chunk_id,
+            "source": self.source,
+            "document_type": self.document_type
+        }
 
 
 class GDPRDocumentProcessor:
@@ -33,6 +104,8 @@ class GDPRDocumentProcessor:
         self.chunk_overlap = self.text_processing.get('chunk_overlap', 200)
         self.min_chunk_size = self.text_processing.get('min_chunk_size', 100)
         self.preserve_structure = self.text_processing.get('preserve_structure', True)
+        # Whether long articles keep their whole-article chunk next to their sub-chunks
+        self.keep_full_article_chunks = self.text_processing.get('keep_full_article_chunks', False)
         
         # GDPR article keywords for violation categorization
         self.violation_categories = {
@@ -54,6 +127,23 @@ class GDPRDocumentProcessor:
             "Records of Processing": ["records of processing activities", "Article 30"],
             "Impact Assessment": ["data protection impact assessment", "DPIA", "Article 35"]
         }
+        # Lowercased once so categorization never case-folds keywords per chunk
+        self._violation_categories_lc = {
+            category: [keyword.lower() for keyword in keywords]
+            for category, keywords in self.violation_categories.items()
+        }
+        # One bit per category, so matches are collected with a single OR each
+        self._category_names = tuple(self.violation_categories)
+        self._category_bits = {name: 1 << i for i, name in enumerate(self._category_names)}
+        self._keyword_automaton = self._build_keyword_automaton()
+        # Without pyahocorasick: one alternation regex per category, each searched in a single C-level scan
+        self._category_patterns = None
+        if self._keyword_automaton is None:
+            self._category_patterns = [
+                (self._category_bits[category], re.compile("|".join(map(re.escape, keywords))))
+                for category, keywords in self._violation_categories_lc.items()
+            ]
+        self._category_cache = LRUCache(maxsize=self.text_processing.get('category_cache_size', 8192))
     
     def process_eur_lex_document(self, doc: Dict) -> List[DocumentChunk]:
         """
@@ -66,6 +156,15 @@ class GDPRDocumentProcessor:
             List of document chunks
         """
         chunks = []
+        language = doc.get('language', 'EN')
+        
+        # Metadata shared by every chunk of this document
+        base_meta = {
+            "source": doc['source'],
+            "document_type": doc['document_type'],
+            "language": language,
+            "url": doc.get('url', '')
+        }
         
         # Process recitals
         for recital in doc.get('recitals', []):
@@ -73,15 +172,12 @@ class GDPRDocumentProcessor:
                 chunk = DocumentChunk(
                     text=f"Recital ({recital['number']}): {recital['content']}",
                     metadata={
-                        "source": doc['source'],
-                        "document_type": doc['document_type'],
-                        "language": doc.get('language', 'EN'),
+                        **base_meta,
                         "structure_type": "recital",
                         "recital_number": recital['number'],
-                        "url": doc.get('url', ''),
                         "violation_categories": self._categorize_text(recital['content'])
                     },
-                    chunk_id=f"eur_lex_recital_{recital['number']}_{doc.get('language', 'EN')}",
+                    chunk_id=f"eur_lex_recital_{recital['number']}_{language}",
                     source="EUR-Lex",
                     document_type="regulation"
                 )
@@ -89,59 +185,62 @@ class GDPRDocumentProcessor:
         
         # Process articles
         for article in doc.get('articles', []):
-            if len(article['content']) >= self.min_chunk_size:
-                # Create chunk with article title and content
-                article_text = f"Article {article['number']}"
-                if article['title']:
-                    article_text += f" - {article['title']}"
-                article_text += f"\n\n{article['content']}"
+            content = article['content']
+            if len(content) >= self.min_chunk_size:
+                number = article['number']
+                title = article['title']
+                chunk_id_prefix = f"eur_lex_article_{number}"
                 
-                chunk = DocumentChunk(
-                    text=article_text,
-                    metadata={
-                        "source": doc['source'],
-                        "document_type": doc['document_type'],
-                        "language": doc.get('language', 'EN'),
-                        "structure_type": "article",
-                        "article_number": article['number'],
-                        "article_title": article['title'],
-                        "url": doc.get('url', ''),
-                        "violation_categories": self._categorize_text(article['content'])
-                    },
-                    chunk_id=f"eur_lex_article_{article['number']}_{doc.get('language', 'EN')}",
-                    source="EUR-Lex",
-                    document_type="regulation"
-                )
-                chunks.append(chunk)
+                # Long articles are additionally split into overlapping sub-chunks
+                split_article = len(content) > self.chunk_size * 2
                 
-                # If article is long, also create sub-chunks
-                if len(article['content']) > self.chunk_size * 2:
+                # The whole-article chunk is optional for split articles, whose text the sub-chunks already cover
+                if not split_article or self.keep_full_article_chunks:
+                    # Create chunk with article title and content
+                    article_text = f"Article {number}"
+                    if title:
+                        article_text += f" - {title}"
+                    article_text += f"\n\n{content}"
+                    
+                    chunk = DocumentChunk(
+                        text=article_text,
+                        metadata={
+                            **base_meta,
+                            "structure_type": "article",
+                            "article_number": number,
+                            "article_title": title,
+                            "violation_categories": self._categorize_text(content)
+                        },
+                        chunk_id=f"{chunk_id_prefix}_{language}",
+                        source="EUR-Lex",
+                        document_type="regulation"
+                    )
+                    chunks.append(chunk)
+                
+                if split_article:
                     sub_chunks = self._create_overlapping_chunks(
-                        article['content'],
-                        prefix=f"Article {article['number']} - {article['title']}\n\n"
+                        content,
+                        prefix=f"Article {number} - {title}\n\n"
                     )
                     
                     for i, sub_chunk_text in enumerate(sub_chunks):
                         sub_chunk = DocumentChunk(
                             text=sub_chunk_text,
                             metadata={
-                                "source": doc['source'],
-                                "document_type": doc['document_type'],
-                                "language": doc.get('language', 'EN'),
+                                **base_meta,
                                 "structure_type": "article_section",
-                                "article_number": article['number'],
-                                "article_title": article['title'],
+                                "article_number": number,
+                                "article_title": title,
                                 "section_index": i,
-                                "url": doc.get('url', ''),
                                 "violation_categories": self._categorize_text(sub_chunk_text)
                             },
-                            chunk_id=f"eur_lex_article_{article['number']}_sec_{i}_{doc.get('language', 'EN')}",
+                            chunk_id=f"{chunk_id_prefix}_sec_{i}_{language}",
                             source="EUR-Lex",
                             document_type="regulation"
                         )
                         chunks.append(sub_chunk)
         
-        logger.info(f"Processed EUR-Lex document: {len(chunks)} chunks created")
+        logger.debug(f"Processed EUR-Lex document: {len(chunks)} chunks created")
         return chunks
     
     def process_edpb_document(self, doc: Dict) -> List[DocumentChunk]:
@@ -156,6 +255,14 @@ class GDPRDocumentProcessor:
         """
         chunks = []
         
+        # Metadata shared by every chunk of this document
+        base_meta = {
+            "source": doc['source'],
+            "document_type": doc['document_type'],
+            "document_title": doc.get('title', ''),
+            "url": doc.get('url', '')
+        }
+        
         # Process sections
         for i, section in enumerate(doc.get('sections', [])):
             section_text = f"{section['title']}\n\n{section['content']}"
@@ -165,13 +272,10 @@ class GDPRDocumentProcessor:
                 chunk = DocumentChunk(
                     text=section_text,
                     metadata={
-                        "source": doc['source'],
-                        "document_type": doc['document_type'],
+                        **base_meta,
                         "structure_type": "section",
                         "section_title": section['title'],
                         "section_level": section.get('level', 'h2'),
-                        "document_title": doc.get('title', ''),
-                        "url": doc.get('url', ''),
                         "violation_categories": self._categorize_text(section['content'])
                     },
                     chunk_id=f"edpb_{doc['document_type']}_{i}",
@@ -190,15 +294,12 @@ class GDPRDocumentProcessor:
                     chunk = DocumentChunk(
                         text=sub_chunk_text,
                         metadata={
-                            "source": doc['source'],
-                            "document_type": doc['document_type'],
+                            **base_meta,
                             "structure_type": "section_part",
                             "section_title": section['title'],
                             "section_level": section.get('level', 'h2'),
                             "section_index": i,
                             "part_index": j,
-                            "document_title": doc.get('title', ''),
-                            "url": doc.get('url', ''),
                             "violation_categories": self._categorize_text(sub_chunk_text)
                         },
                         chunk_id=f"edpb_{doc['document_type']}_{i}_part_{j}",
@@ -207,7 +308,7 @@ class GDPRDocumentProcessor:
                     )
                     chunks.append(chunk)
         
-        logger.info(f"Processed EDPB document '{doc.get('title', 'Unknown')}': {len(chunks)} chunks created")
+        logger.debug(f"Processed EDPB document '{doc.get('title', 'Unknown')}': {len(chunks)} chunks created")
         return chunks
     
     def process_case_law_document(self, doc: Dict) -> List[DocumentChunk]:
@@ -225,6 +326,15 @@ class GDPRDocumentProcessor:
         # Extract case details
         case_details = doc.get('case_details', {})
         
+        # Metadata shared by every chunk of this case
+        base_meta = {
+            "source": doc['source'],
+            "document_type": doc['document_type'],
+            "case_title": doc.get('title', ''),
+            "url": doc.get('url', ''),
+            "case_details": case_details
+        }
+        
         # Create chunk from case summary/facts
         for i, section in enumerate(doc.get('sections', [])):
             if len(section['content']) >= self.min_chunk_size:
@@ -234,14 +344,10 @@ class GDPRDocumentProcessor:
                     chunk = DocumentChunk(
                         text=section_text,
                         metadata={
-                            "source": doc['source'],
-                            "document_type": doc['document_type'],
+                            **base_meta,
                             "structure_type": "case_section",
-                            "case_title": doc.get('title', ''),
                             "section_title": section['title'],
                             "section_level": section.get('level', 'h2'),
-                            "url": doc.get('url', ''),
-                            "case_details": case_details,
                             "violation_categories": self._categorize_text(section['content'])
                         },
                         chunk_id=f"case_{doc.get('pageid', '')}_{i}",
@@ -260,16 +366,12 @@ class GDPRDocumentProcessor:
                         chunk = DocumentChunk(
                             text=sub_chunk_text,
                             metadata={
-                                "source": doc['source'],
-                                "document_type": doc['document_type'],
+                                **base_meta,
                                 "structure_type": "case_section_part",
-                                "case_title": doc.get('title', ''),
                                 "section_title": section['title'],
                                 "section_level": section.get('level', 'h2'),
                                 "section_index": i,
                                 "part_index": j,
-                                "url": doc.get('url', ''),
-                                "case_details": case_details,
                                 "violation_categories": self._categorize_text(sub_chunk_text)
                             },
                             chunk_id=f"case_{doc.get('pageid', '')}_{i}_part_{j}",
@@ -278,7 +380,7 @@ class GDPRDocumentProcessor:
                         )
                         chunks.append(chunk)
         
-        logger.info(f"Processed case law '{doc.get('title', 'Unknown')}': {len(chunks)} chunks created")
+        logger.debug(f"Processed case law '{doc.get('title', 'Unknown')}': {len(chunks)} chunks created")
         return chunks
     
     def _create_overlapping_chunks(self, text: str, prefix: str = "") -> List[str]:
@@ -297,8 +399,11 @@ class GDPRDocumentProcessor:
         # Split by sentences for better chunking
         sentences = self._split_into_sentences(text)
         
+        prefix_length = len(prefix)
         current_chunk = []
-        current_length = len(prefix)
+        current_length = prefix_length
+        # Lengths of the last 3 sentences, which are carried over as overlap
+        overlap_lengths = deque(maxlen=3)
         
         for sentence in sentences:
             sentence_length = len(sentence)
@@ -308,13 +413,14 @@ class GDPRDocumentProcessor:
                 chunk_text = prefix + " ".join(current_chunk)
                 chunks.append(chunk_text)
                 
-                # Start new chunk with overlap
-                overlap_text = " ".join(current_chunk[-3:])  # Last 3 sentences for context
-                current_chunk = current_chunk[-3:] if len(current_chunk) >= 3 else current_chunk
-                current_length = len(prefix) + len(overlap_text)
+                # Start new chunk with the last 3 sentences for context; its length
+                # is that of the joined overlap, counted without building the string
+                current_chunk = current_chunk[-3:]
+                current_length = prefix_length + sum(overlap_lengths) + len(overlap_lengths) - 1
             
             current_chunk.append(sentence)
             current_length += sentence_length
+            overlap_lengths.append(sentence_length)
         
         # Add final chunk
         if current_chunk:
@@ -327,126 +433,257 @@ class GDPRDocumentProcessor:
     def _split_into_sentences(self, text: str) -> List[str]:
         """Split text into sentences with improved handling for legal text"""
         # Enhanced sentence splitting that handles common legal text patterns
-        # Handle abbreviations like "Art.", "No.", "e.g.", "i.e."
-        text = re.sub(r'\b(Art|No|e\.g|i\.e)\.\s', r'\1PLACEHOLDER ', text)
+        # Mask abbreviation periods with a NUL sentinel so they are not split on
+        text = _ABBREV_RE.sub('\\1\x00 ', text)
         
-        # Split on sentence boundaries (period/question/exclamation followed by space and capital)
-        sentences = re.split(r'(?<=[.!?])\s+(?=[A-Z(])', text)
+        # Split on sentence boundaries
+        sentences = _SENT_SPLIT_RE.split(text)
         
         # Restore abbreviations
-        sentences = [s.replace('PLACEHOLDER', '.') for s in sentences]
+        sentences = [s.replace('\x00', '.') for s in sentences]
         
         # Filter out very short sentences (likely fragments)
         return [s.strip() for s in sentences if s.strip() and len(s.strip()) > 10]
     
-    def _categorize_text(self, text: str) -> List[str]:
+    def _build_keyword_automaton(self):
+        """
+        Build an Aho-Corasick automaton over all lowercased category keywords
+        
+        Each keyword maps to the bitmask of the categories it belongs to.
+        Returns None when pyahocorasick is not installed.
+        """
+        if ahocorasick is None:
+            return None
+        
+        keyword_masks = {}
+        for category, keywords in self._violation_categories_lc.items():
+            category_bit = self._category_bits[category]
+            for keyword_lower in keywords:
+                keyword_masks[keyword_lower] = keyword_masks.get(keyword_lower, 0) | category_bit
+        return _compile_keyword_automaton(tuple(keyword_masks.items()))
+    
+    def _categorize_text(self, text: str, text_lower: Optional[str] = None) -> List[str]:
         """
         Categorize text based on GDPR violation categories
         
+        With pyahocorasick installed, all keywords are matched in one linear
+        pass over the text instead of one substring search per keyword.
+        
         Args:
             text: Text to categorize
+            text_lower: text.lower(), if the caller already has it
         
         Returns:
             List of applicable violation categories
         """
-        text_lower = text.lower()
-        categories = []
+        if text_lower is None:
+            text_lower = text.lower()
         
-        for category, keywords in self.violation_categories.items():
-            for keyword in keywords:
-                if keyword.lower() in text_lower:
-                    categories.append(category)
-                    break
+        # Identical texts (repeated boilerplate sections, re-processed documents) are scanned once
+        cached = self._category_cache.get(text_lower)
+        if cached is not None:
+            return list(cached)
         
-        return list(set(categories))  # Remove duplicates
+        categories = self._match_categories(text_lower)
+        self._category_cache.put(text_lower, tuple(categories))
+        return categories
     
-    def process_all_documents(self, raw_data_dir: str = "data/raw") -> List[DocumentChunk]:
+    def _match_categories(self, text_lower: str) -> List[str]:
+        """Scan lowercased text for the keywords of every violation category"""
+        mask = 0
+        if self._keyword_automaton is not None:
+            for _, keyword_mask in self._keyword_automaton.iter(text_lower):
+                mask |= keyword_mask
+        else:
+            for category_bit, pattern in self._category_patterns:
+                if pattern.search(text_lower):
+                    mask |= category_bit
+        
+        # Decode in declaration order, so results are stable across runs
+        return [name for i, name in enumerate(self._category_names) if mask >> i & 1]
+    
+    def _find_documents(self, raw_data_dir: str) -> List[tuple]:
+        """
+        List the collected document files under raw_data_dir
+        
+        Each source directory is listed with a single os.scandir call (no
+        separate exists() check or glob per pattern).
+        
+        Returns:
+            (kind, path) tuples in processing order, kind being one of
+            "eur_lex", "edpb", "edpb_jsonl" or "case_law"
+        """
+        raw_path = Path(raw_data_dir)
+        files = []
+        
+        # (directory, required name prefix, suffix -> kind); EDPB guidelines are
+        # collected into one .jsonl file, one document per line
+        sources = [
+            ("eur_lex", "", {".json": "eur_lex"}),
+            ("edpb", "", {".json": "edpb", ".jsonl": "edpb_jsonl"}),
+            ("gdprhub", "case_", {".json": "case_law"})
+        ]
+        for directory, prefix, kinds in sources:
+            try:
+                entries = list(os.scandir(raw_path / directory))
+            except FileNotFoundError:
+                continue
+            
+            # Listed suffix by suffix, so e.g. all EDPB .json files come before the .jsonl ones
+            for suffix, kind in kinds.items():
+                files.extend(
+                    (kind, Path(entry.path)) for entry in entries
+                    if entry.name.startswith(prefix) and entry.name.endswith(suffix) and entry.is_file()
+                )
+        
+        return files
+    
+    def _process_file(self, kind: str, path: Path) -> List[DocumentChunk]:
+        """Load one collected document file and chunk it"""
+        if kind == "edpb_jsonl":
+            chunks = []
+            with open(path, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        chunks.extend(self.process_edpb_document(_parse_json(line)))
+            return chunks
+        
+        doc = _load_json(path)
+        if kind == "eur_lex":
+            return self.process_eur_lex_document(doc)
+        if kind == "edpb":
+            return self.process_edpb_document(doc)
+        return self.process_case_law_document(doc)
+    
+    def iter_chunks(self, raw_data_dir: str = "data/raw", files: Optional[List[tuple]] = None) -> Iterator[DocumentChunk]:
+        """
+        Yield the chunks of every collected document, one file at a time
+        
+        With performance.parallel_processing enabled, files are chunked in
+        up to performance.max_workers processes; chunks are still yielded
+        in file order, so the output does not depend on the worker count.
+        
+        Args:
+            raw_data_dir: Directory containing raw collected data
+            files: (kind, path) tuples from _find_documents, if already listed
+        
+        Yields:
+            Document chunks
+        """
+        if files is None:
+            files = self._find_documents(raw_data_dir)
+        
+        performance = self.config.get('performance', {})
+        max_workers = min(performance.get('max_workers') or os.cpu_count() or 1, len(files))
+        if not performance.get('parallel_processing', False) or max_workers <= 1:
+            for kind, path in files:
+                yield from self._process_file(kind, path)
+            return
+        
+        logger.info(f"Processing {len(files)} files with {max_workers} worker processes")
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(self.config,)
+        ) as executor:
+            for chunks in executor.map(_process_file_in_worker, files, chunksize=8):
+                yield from chunks
+    
+    def process_all_documents(self, raw_data_dir: str = "data/raw") -> int:
         """
         Process all collected documents
         
+        Chunks are written to disk as they are produced, so only one
+        document's chunks are held in memory at a time.
+        
         Args:
             raw_data_dir: Directory containing raw collected data
         
         Returns:
-            List of all document chunks
+            Number of chunks created
         """
-        all_chunks = []
-        raw_path = Path(raw_data_dir)
-        
         logger.info("Processing all collected documents...")
+        start_time = time.perf_counter()
+        
+        files = self._find_documents(raw_data_dir)
+        total_chunks = self._save_chunks(self.iter_chunks(raw_data_dir, files))
         
-        # Process EUR-Lex documents
-        eur_lex_dir = raw_path / "eur_lex"
-        if eur_lex_dir.exists():
-            for json_file in eur_lex_dir.glob("*.json"):
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    doc = json.load(f)
-                chunks = self.process_eur_lex_document(doc)
-                all_chunks.extend(chunks)
-        
-        # Process EDPB documents
-        edpb_dir = raw_path / "edpb"
-        if edpb_dir.exists():
-            for json_file in edpb_dir.glob("*.json"):
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    doc = json.load(f)
-                chunks = self.process_edpb_document(doc)
-                all_chunks.extend(chunks)
-        
-        # Process case law
-        gdprhub_dir = raw_path / "gdprhub"
-        if gdprhub_dir.exists():
-            for json_file in gdprhub_dir.glob("case_*.json"):
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    doc = json.load(f)
-                chunks = self.process_case_law_document(doc)
-                all_chunks.extend(chunks)
-        
-        logger.info(f"Total chunks created: {len(all_chunks)}")
-        
-        # Save processed chunks
-        self._save_chunks(all_chunks)
-        
-        return all_chunks
+        # Per-document counts are logged at DEBUG; one summary line at INFO
+        elapsed = time.perf_counter() - start_time
+        logger.info(f"Processed {len(files)} document files into {total_chunks} chunks in {elapsed:.2f}s")
+        return total_chunks
     
-    def _save_chunks(self, chunks: List[DocumentChunk]):
-        """Save processed chunks to disk"""
-        output_dir = Path("data/processed")
-        output_dir.mkdir(parents=True, exist_ok=True)
+    def _save_chunks(self, chunks: Iterable[DocumentChunk]) -> int:
+        """
+        Stream processed chunks to disk and save a summary of them
         
-        # Save all chunks
-        output_file = output_dir / "all_chunks.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump([chunk.to_dict() for chunk in chunks], f, ensure_ascii=False, indent=2)
+        all_chunks.json stays a JSON array (one chunk per line), the format
+        the build command loads.
         
-        logger.info(f"Saved {len(chunks)} chunks to {output_file}")
+        Args:
+            chunks: Chunks to save, consumed once
+        
+        Returns:
+            Number of chunks saved
+        """
+        output_dir = Path("data/processed")
+        output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Save summary
         summary = {
-            "total_chunks": len(chunks),
+            "total_chunks": 0,
             "by_source": {},
             "by_type": {},
             "by_category": {}
         }
         
-        for chunk in chunks:
-            # Count by source
-            source = chunk.source
-            summary["by_source"][source] = summary["by_source"].get(source, 0) + 1
-            
-            # Count by document type
-            doc_type = chunk.document_type
-            summary["by_type"][doc_type] = summary["by_type"].get(doc_type, 0) + 1
-            
-            # Count by violation categories
-            for category in chunk.metadata.get('violation_categories', []):
-                summary["by_category"][category] = summary["by_category"].get(category, 0) + 1
+        # Save all chunks, counting them for the summary in the same pass
+        output_file = output_dir / "all_chunks.json"
+        with open(output_file, 'wb') as f:
+            f.write(b"[")
+            for chunk in chunks:
+                if summary["total_chunks"]:
+                    f.write(b",")
+                f.write(b"\n")
+                f.write(_dump_json(chunk.to_dict()))
+                summary["total_chunks"] += 1
+                
+                # Count by source
+                source = chunk.source
+                summary["by_source"][source] = summary["by_source"].get(source, 0) + 1
+                
+                # Count by document type
+                doc_type = chunk.document_type
+                summary["by_type"][doc_type] = summary["by_type"].get(doc_type, 0) + 1
+                
+                # Count by violation categories
+                for category in chunk.metadata.get('violation_categories', []):
+                    summary["by_category"][category] = summary["by_category"].get(category, 0) + 1
+            f.write(b"\n]\n")
         
+        logger.info(f"Saved {summary['total_chunks']} chunks to {output_file}")
+        
+        # Save summary
         summary_file = output_dir / "processing_summary.json"
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, ensure_ascii=False, indent=2)
+        summary_file.write_bytes(_dump_json(summary, indent=True))
         
         logger.info(f"Saved processing summary to {summary_file}")
+        return summary["total_chunks"]
+
+
+# Per-process processor used by the ProcessPoolExecutor workers of iter_chunks
+_worker_processor: Optional[GDPRDocumentProcessor] = None
+
+
+def _init_worker(config: Dict) -> None:
+    """Build the worker's processor once instead of once per file"""
+    global _worker_processor
+    _worker_processor = GDPRDocumentProcessor(config)
+
+
+def _process_file_in_worker(task: tuple) -> List[DocumentChunk]:
+    """Chunk one (kind, path) file in a worker process"""
+    kind, path = task
+    return _worker_processor._process_file(kind, path)
 
 
 if __name__ == "__main__":
@@ -2,13 +2,18 @@
 RAG System - Retrieval-Augmented Generation for GDPR Compliance
 Integrates FAISS vector store with Ollama for intelligent Q&A
 """
-import sys
+import copy
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-sys.path.append(str(Path(__file__).parent.parent))
-
-from typing import Dict, List, Optional
+from string import Formatter
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from loguru import logger
 import json
+import numpy as np
 
 try:
     import ollama
@@ -16,7 +21,91 @@ except ImportError:
     logger.error("Ollama package not installed. Install with: pip install ollama")
     raise
 
-from vectorstore.faiss_store import FAISSVectorStore
+from ..vectorstore.faiss_store import FAISSVectorStore
+from ..utils import LRUCache, load_config, resolve_device, resolve_embedding_device, tune_faiss_index
+
+# Rerank quality tiers, adjusted to observed legal text scores (typically 0.25-0.55):
+# Marginal (may not be relevant) < 0.30 <= Fair (still relevant) < 0.38 <= Good < 0.45 <= Excellent (very rare)
+QUALITY_TIER_BOUNDS = np.array([0.30, 0.38, 0.45])
+QUALITY_TIERS = np.array(['Marginal', 'Fair', 'Good', 'Excellent'])
+
+DEFAULT_QUERY_PROMPT = """Based on the following context from GDPR regulations, guidelines, and case law, please answer the question.
+
+Context:
+{context}
+
+Question: {query}
+
+Please provide a comprehensive answer citing specific GDPR articles, recitals, or guidelines where applicable."""
+
+
+def compile_template(template: str) -> Callable[..., str]:
+    """
+    Parse a str.format template once and return a function rendering it
+
+    The returned function joins the literal fragments with the keyword
+    arguments, skipping the format-string parser on every call. Templates
+    using conversions, format specs or attribute/index lookups fall back to
+    template.format.
+    """
+    fragments = []
+    fields = []
+    for literal, field, format_spec, conversion in Formatter().parse(template):
+        if field is not None and (format_spec or conversion or not field.isidentifier()):
+            return template.format
+        fragments.append(literal)
+        fields.append(field)
+
+    def render(**values) -> str:
+        parts = []
+        for literal, field in zip(fragments, fields):
+            parts.append(literal)
+            if field is not None:
+                parts.append(str(values[field]))
+        return ''.join(parts)
+
+    return render
+
+
+# Stands in for the query and context when cutting the query prompt at its first variable part
+PREFIX_MARKER = "\x00prefix\x00"
+
+# Rough characters per LLM token for English/EU legal text; avoids loading the model's tokenizer
+CHARS_PER_TOKEN = 4
+# Documents whose share of the context budget is smaller than this are left out
+MIN_DOC_CHARS = 200
+
+
+def _truncate_at_sentence(text: str, max_chars: int) -> str:
+    """Cut text to at most max_chars, at the last sentence end when there is one in the second half"""
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind('. ', 0, max_chars)
+    if cut >= max_chars // 2:
+        return text[:cut + 1]
+    return text[:max_chars].rstrip() + '...'
+
+
+def _fit_to_budget(texts: List[str], docs: List[Dict], max_chars: int) -> List[str]:
+    """
+    Trim document texts so together they stay within max_chars
+
+    Nothing changes when the texts already fit. Otherwise the budget is split
+    in proportion to each document's relevance (1 + rerank score, so
+    unreranked results share it equally); documents that would get less than
+    MIN_DOC_CHARS are dropped (returned as "").
+    """
+    if sum(map(len, texts)) <= max_chars:
+        return texts
+
+    weights = [1.0 + doc.get('rerank_score', 0.0) for doc in docs]
+    total_weight = sum(weights)
+    fitted = []
+    for text, weight in zip(texts, weights):
+        share = int(max_chars * weight / total_weight)
+        fitted.append(_truncate_at_sentence(text, share) if share >= MIN_DOC_CHARS else "")
+    logger.info(f"Trimmed context from {sum(map(len, texts))} to {sum(map(len, fitted))} chars to fit the token budget")
+    return fitted
 
 
 class GDPRRAGSystem:
@@ -27,19 +116,38 @@ class GDPRRAGSystem:
         self.ollama_config = config.get('ollama', {})
         self.retrieval_config = config.get('retrieval', {})
         self.prompts = config.get('prompts', {})
+        self._render_query_prompt = compile_template(self.prompts.get('query_prompt', DEFAULT_QUERY_PROMPT))
         
         # Initialize Ollama client
         self.base_url = self.ollama_config.get('base_url', 'http://localhost:11434')
         self.model = self.ollama_config.get('model', 'gpt-oss:latest')
         self.temperature = self.ollama_config.get('temperature', 0.1)
+        # Requests the Ollama server handles at once (its OLLAMA_NUM_PARALLEL)
+        self.num_parallel = int(
+            self.ollama_config.get('num_parallel') or os.environ.get('OLLAMA_NUM_PARALLEL', 1)
+        )
         
         logger.info(f"Initializing RAG system with Ollama model: {self.model}")
         
+        # One long-lived client for every chat/generate call, so connections to the
+        # server are kept alive and reused (and base_url/timeout are honoured)
+        self.ollama_client = self._create_ollama_client()
+        self.keep_alive = self.ollama_config.get('keep_alive')
+        
+        # Exact-match cache of full query results (emptied when the index changes)
+        cache_size = config.get('performance', {}).get('query_cache_size', 128)
+        self.query_cache = LRUCache(maxsize=cache_size)
+        # Raw cross-encoder scores per (query, document text) pair
+        rerank_cache_size = config.get('performance', {}).get('rerank_cache_size', 4096)
+        self.rerank_cache = LRUCache(maxsize=rerank_cache_size)
+        # LLM responses per (model, prompts, options); optionally persisted across runs
+        self._init_generation_cache(config.get('performance', {}))
+        
         # Initialize vector store
-        self.vector_store = FAISSVectorStore(config)
+        self.vector_store = FAISSVectorStore(resolve_embedding_device(config))
         
         # Load existing index
-        if not self.vector_store.load_index():
+        if not self.load_index():
             logger.warning("No existing index found. Please build the index first.")
         
         # Initialize reranker if enabled
@@ -49,10 +157,124 @@ class GDPRRAGSystem:
                 from sentence_transformers import CrossEncoder
                 model_name = self.retrieval_config.get('rerank_model', 'cross-encoder/ms-marco-MiniLM-L-6-v2')
                 logger.info(f"Loading reranker model: {model_name}")
-                self.reranker = CrossEncoder(model_name, max_length=512)
+                # Same device as the embedding model unless retrieval.rerank_device says otherwise
+                device = resolve_device(
+                    self.retrieval_config.get('rerank_device')
+                    or config.get('embeddings', {}).get('device', 'auto')
+                )
+                self.reranker = CrossEncoder(model_name, max_length=512, device=device)
+                self.reranker.model.eval()
+                
+                # Half precision on GPU: half the memory traffic, tensor-core matmuls
+                if self.reranker.model.device.type == 'cuda':
+                    import torch
+                    torch.backends.cuda.matmul.allow_tf32 = True
+                    self.reranker.model.half()
+                    logger.info("  Reranker running in fp16 on GPU")
+                
+                # Same activation predict() would apply (renamed in newer sentence-transformers)
+                self._rerank_activation = (
+                    getattr(self.reranker, 'activation_fn', None)
+                    or getattr(self.reranker, 'default_activation_function', None)
+                )
+                if self._rerank_activation is None:
+                    import torch
+                    self._rerank_activation = torch.nn.Identity()
                 logger.info("✓ Reranker loaded successfully")
             except Exception as e:
                 logger.warning(f"Could not load reranker: {e}. Continuing without reranking.")
+        
+        if self.ollama_config.get('warmup', False):
+            self.warmup()
+    
+    def warmup(self) -> None:
+        """
+        Take the cold-start costs before the first query
+        
+        Runs one reranker forward pass (CUDA context, kernel selection) here,
+        and asks Ollama to load the model on a background thread, so start-up
+        is not blocked on the LLM load.
+        """
+        if self.reranker is not None:
+            try:
+                self.reranker.predict([("warmup", "warmup text")], show_progress_bar=False)
+            except Exception as e:
+                logger.warning(f"Reranker warmup failed: {e}")
+        
+        def load_model():
+            try:
+                # An empty prompt only loads the model (and keeps it for keep_alive)
+                self.ollama_client.generate(model=self.model, prompt='', keep_alive=self.keep_alive)
+                logger.info(f"✓ Ollama model {self.model} loaded")
+            except Exception as e:
+                logger.warning(f"Could not preload Ollama model {self.model}: {e}")
+        
+        threading.Thread(target=load_model, name="ollama-warmup", daemon=True).start()
+    
+    def _create_ollama_client(self):
+        """Create the Ollama client with a keep-alive connection pool"""
+        import httpx
+        
+        timeout = self.ollama_config.get('timeout', 180)
+        return ollama.Client(
+            host=self.base_url,
+            timeout=httpx.Timeout(timeout, connect=10.0),
+            limits=httpx.Limits(
+                max_keepalive_connections=max(self.num_parallel, 4),
+                max_connections=max(self.num_parallel * 2, 8),
+                keepalive_expiry=30.0
+            )
+        )
+    
+    def _init_generation_cache(self, performance_config: Dict) -> None:
+        """Set up the in-memory (and optional on-disk) cache of generated responses"""
+        self.generation_cache = LRUCache(maxsize=performance_config.get('generation_cache_size', 256))
+        self.generation_disk_cache = None
+        if performance_config.get('persist_generation_cache', False):
+            try:
+                import diskcache
+                cache_dir = Path(performance_config.get('cache_dir', '.cache')) / 'generations'
+                self.generation_disk_cache = diskcache.Cache(str(cache_dir))
+                logger.info(f"✓ Persistent generation cache at {cache_dir}")
+            except ImportError:
+                logger.warning("diskcache not installed; generation cache is kept in memory only")
+    
+    def _generation_key(self, system_prompt: str, user_prompt: str, options: Dict) -> str:
+        """Content address of a chat request: model, both prompts and the sampling options"""
+        payload = "\x00".join([self.model, system_prompt, user_prompt, json.dumps(options, sort_keys=True)])
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _get_cached_generation(self, key: str) -> Optional[Dict]:
+        """Return a copy of the cached response for key, checking memory then disk"""
+        cached = self.generation_cache.get(key)
+        if cached is None and self.generation_disk_cache is not None:
+            cached = self.generation_disk_cache.get(key)
+            if cached is not None:
+                self.generation_cache.put(key, cached)
+        return copy.deepcopy(cached) if cached is not None else None
+    
+    def _cache_generation(self, key: str, response: Dict) -> None:
+        """Store a successful response in the generation cache(s)"""
+        self.generation_cache.put(key, copy.deepcopy(response))
+        if self.generation_disk_cache is not None:
+            self.generation_disk_cache.set(key, response)
+    
+    def load_index(self, path: Optional[Path] = None) -> bool:
+        """
+        Load a FAISS index into the vector store and tune it for search
+        
+        Args:
+            path: Index location (defaults to the configured store path)
+        
+        Returns:
+            True if the index was loaded
+        """
+        loaded = self.vector_store.load_index(path) if path else self.vector_store.load_index()
+        if loaded:
+            tune_faiss_index(self.vector_store.index, self.config)
+        self.query_cache.clear()
+        self.rerank_cache.clear()
+        return loaded
     
     def retrieve_context(
         self,
@@ -85,6 +307,55 @@ class GDPRRAGSystem:
             filter_metadata=filters
         )
         
+        return self._rank_results(query, results, top_k)
+    
+    def retrieve_context_batch(
+        self,
+        queries: List[str],
+        top_k: Optional[int] = None,
+        filters: Optional[Dict] = None
+    ) -> List[List[Dict]]:
+        """
+        Retrieve context for several queries at once
+        
+        FAISS parallelises over the queries of a batch, so when the vector store
+        supports batched search all queries are embedded and searched in one call.
+        
+        Args:
+            queries: List of user queries
+            top_k: Number of documents to retrieve per query
+            filters: Metadata filters
+        
+        Returns:
+            One list of relevant documents per query, in input order
+        """
+        if top_k is None:
+            top_k = self.retrieval_config.get('top_k', 5)
+        
+        logger.info(f"Retrieving context for {len(queries)} queries in one batch")
+        
+        retrieve_k = top_k * 2 if self.reranker else top_k
+        
+        search_batch = getattr(self.vector_store, 'search_batch', None)
+        if search_batch is not None:
+            batch_results = search_batch(
+                queries=queries,
+                top_k=retrieve_k,
+                filter_metadata=filters
+            )
+        else:
+            batch_results = [
+                self.vector_store.search(query=query, top_k=retrieve_k, filter_metadata=filters)
+                for query in queries
+            ]
+        
+        return [
+            self._rank_results(query, results, top_k)
+            for query, results in zip(queries, batch_results)
+        ]
+    
+    def _rank_results(self, query: str, results: List[Dict], top_k: int) -> List[Dict]:
+        """Apply score threshold and optional reranking to raw search results"""
         # Filter by score threshold (PERMISSIVE - we'll rerank to find quality)
         score_threshold = self.retrieval_config.get('score_threshold', 0.7)
         filtered_results = [r for r in results if r['score'] >= score_threshold]
@@ -93,17 +364,13 @@ class GDPRRAGSystem:
         if self.reranker and filtered_results:
             logger.info(f"Reranking {len(filtered_results)} candidates...")
             
-            # Prepare query-document pairs for reranking
-            pairs = [(query, doc['text'][:512]) for doc in filtered_results]  # Limit to 512 chars for cross-encoder
-            
             # Get reranking scores (raw logits from cross-encoder)
-            rerank_scores = self.reranker.predict(pairs)
+            rerank_scores = self._rerank_scores(query, filtered_results)
             
             # Normalize scores using MIN-MAX scaling instead of sigmoid
             # Legal text cross-encoder gives very negative logits (-20 to -5)
             # Sigmoid doesn't work well - use min-max normalization instead
-            import numpy as np
-            rerank_scores = np.array(rerank_scores)
+            rerank_scores = np.asarray(rerank_scores, dtype=np.float64)
             
             # Min-max normalization to 0-1 range
             min_score = rerank_scores.min()
@@ -116,14 +383,19 @@ class GDPRRAGSystem:
                 # All scores are the same - assign 0.5
                 normalized_scores = np.full_like(rerank_scores, 0.5)
             
+            # Quality tier of every score in one lookup (same bounds as _classify_quality_tier)
+            tiers = QUALITY_TIERS[np.searchsorted(QUALITY_TIER_BOUNDS, normalized_scores, side='right')]
+            
             # Add normalized rerank scores
-            for doc, raw_score, norm_score in zip(filtered_results, rerank_scores, normalized_scores):
-                doc['rerank_score_raw'] = float(raw_score)
-                doc['rerank_score'] = float(norm_score)
+            for doc, raw_score, norm_score, tier in zip(
+                filtered_results, rerank_scores.tolist(), normalized_scores.tolist(), tiers.tolist()
+            ):
+                doc['rerank_score_raw'] = raw_score
+                doc['rerank_score'] = norm_score
                 # IMPORTANT: Use rerank score as primary - it's more accurate than vector similarity
                 # The RELATIVE ordering matters more than absolute scores
-                doc['combined_score'] = doc['rerank_score']
-                doc['quality_tier'] = self._classify_quality_tier(doc['rerank_score'])
+                doc['combined_score'] = norm_score
+                doc['quality_tier'] = tier
             
             # Sort by rerank score (higher is better) - TOP results are highest quality
             filtered_results.sort(key=lambda x: x['rerank_score'], reverse=True)
@@ -148,6 +420,57 @@ class GDPRRAGSystem:
         
         return filtered_results
     
+    def _rerank_scores(self, query: str, docs: List[Dict]) -> np.ndarray:
+        """
+        Score query-document pairs with the cross-encoder in one forward pass
+        
+        All pairs are tokenized as one padded batch, truncated at the
+        reranker's token limit (512) rather than at a character count, and
+        fed straight to the model instead of going through predict()'s
+        mini-batching. Pairs scored before are taken from rerank_cache and
+        only the rest go through the model.
+        
+        Args:
+            query: User query
+            docs: Candidate documents
+        
+        Returns:
+            One score per document (after the reranker's activation function)
+        """
+        cache_keys = [(query, doc['text']) for doc in docs]
+        scores = np.array([self.rerank_cache.get(key, np.nan) for key in cache_keys], dtype=np.float64)
+        misses = np.flatnonzero(np.isnan(scores))
+        if len(misses) == 0:
+            logger.info(f"  All {len(docs)} rerank scores cached")
+            return scores
+        
+        import torch
+        
+        features = self.reranker.tokenizer(
+            [query] * len(misses),
+            [docs[i]['text'] for i in misses],
+            padding=True,
+            truncation='longest_first',
+            max_length=self.reranker.max_length,
+            return_tensors='pt'
+        )
+        device = self.reranker.model.device
+        if device.type == 'cuda':
+            # Page-locked host buffers let the copies to the GPU run as async DMA
+            features = {name: tensor.pin_memory().to(device, non_blocking=True) for name, tensor in features.items()}
+        else:
+            features = features.to(device)
+        
+        with torch.inference_mode():
+            logits = self.reranker.model(**features).logits
+            new_scores = self._rerank_activation(logits.float()).squeeze(-1).cpu().numpy()
+        
+        scores[misses] = new_scores
+        for i, score in zip(misses.tolist(), new_scores.tolist()):
+            self.rerank_cache.put(cache_keys[i], score)
+        
+        return scores
+    
     def _classify_quality_tier(self, rerank_score: float) -> str:
         """
         Classify rerank score into quality tier for legal text
@@ -160,46 +483,88 @@ class GDPRRAGSystem:
         Returns:
             Quality tier: 'Excellent', 'Good', 'Fair', 'Marginal'
         """
-        # Adjusted thresholds based on observed legal text scores (typically 0.25-0.55)
-        if rerank_score >= 0.45:
-            return 'Excellent'  # Top tier - very rare for legal text
-        elif rerank_score >= 0.38:
-            return 'Good'       # High quality - best matches
-        elif rerank_score >= 0.30:
-            return 'Fair'       # Acceptable - still relevant
-        else:
-            return 'Marginal'   # Low confidence - may not be relevant
+        return str(QUALITY_TIERS[np.searchsorted(QUALITY_TIER_BOUNDS, rerank_score, side='right')])
     
-    def format_context(self, retrieved_docs: List[Dict]) -> str:
+    def format_context(self, retrieved_docs: List[Dict], max_tokens: Optional[int] = None) -> str:
         """
         Format retrieved documents into context string
         
+        Document texts are trimmed to fit retrieval.max_tokens_context (prompt
+        prefill time grows with every context token), see _fit_to_budget.
+        
         Args:
             retrieved_docs: List of retrieved documents
+            max_tokens: Token budget for the document texts (defaults to retrieval.max_tokens_context)
         
         Returns:
             Formatted context string
         """
+        if max_tokens is None:
+            max_tokens = self.retrieval_config.get('max_tokens_context')
+        texts = [doc['text'] for doc in retrieved_docs]
+        if max_tokens:
+            texts = _fit_to_budget(texts, retrieved_docs, max_tokens * CHARS_PER_TOKEN)
+        
         context_parts = []
         
-        for i, doc in enumerate(retrieved_docs, 1):
-            metadata = doc['metadata']
-            text = doc['text']
+        for i, (doc, text) in enumerate(zip(retrieved_docs, texts), 1):
+            if not text:
+                continue
+            meta_get = doc['metadata'].get
             
             # Format with source information
-            source_info = f"[Source {i}: {metadata.get('source', 'Unknown')}"
-            
-            if metadata.get('article_number'):
-                source_info += f", Article {metadata['article_number']}"
-            elif metadata.get('section_title'):
-                source_info += f", {metadata['section_title']}"
-            
-            source_info += "]"
+            article_number = meta_get('article_number')
+            section_title = meta_get('section_title')
+            if article_number:
+                location = f", Article {article_number}"
+            elif section_title:
+                location = f", {section_title}"
+            else:
+                location = ""
             
-            context_parts.append(f"{source_info}\n{text}\n")
+            context_parts.append(f"[Source {i}: {meta_get('source', 'Unknown')}{location}]\n{text}\n")
         
         return "\n---\n".join(context_parts)
     
+    def _build_chat_request(
+        self,
+        query: str,
+        context: str,
+        system_prompt: Optional[str] = None,
+        custom_prompt_template: Optional[str] = None
+    ) -> Tuple[str, str, Dict]:
+        """
+        Build the prompts and Ollama options for answering a query
+        
+        Returns:
+            Tuple of (system_prompt, user_prompt, options)
+        """
+        # Prepare system prompt
+        if system_prompt is None:
+            system_prompt = self.prompts.get('system_prompt', 
+                'You are a GDPR compliance expert. Provide accurate answers based on the context.')
+        
+        # Prepare user prompt with enhanced template
+        if custom_prompt_template:
+            user_prompt = custom_prompt_template.format(context=context, query=query)
+        else:
+            # Enhanced query prompt from config or default, parsed once in __init__
+            user_prompt = self._render_query_prompt(context=context, query=query)
+        
+        # Get options from config with anti-hallucination settings
+        options = {
+            'temperature': self.temperature,
+            'top_k': self.ollama_config.get('top_k', 40),
+            'top_p': self.ollama_config.get('top_p', 0.9),
+        }
+        
+        # Add optional parameters including num_predict for response length
+        for param in ['num_ctx', 'num_predict', 'repeat_penalty', 'presence_penalty', 'frequency_penalty']:
+            if param in self.ollama_config:
+                options[param] = self.ollama_config[param]
+        
+        return system_prompt, user_prompt, options
+    
     def generate_response(
         self,
         query: str,
@@ -219,51 +584,29 @@ class GDPRRAGSystem:
         Returns:
             Dictionary with response and metadata
         """
-        # Prepare system prompt
-        if system_prompt is None:
-            system_prompt = self.prompts.get('system_prompt', 
-                'You are a GDPR compliance expert. Provide accurate answers based on the context.')
-        
-        # Prepare user prompt with enhanced template
-        if custom_prompt_template:
-            user_prompt = custom_prompt_template.format(context=context, query=query)
-        else:
-            # Use enhanced query prompt from config or default
-            query_template = self.prompts.get('query_prompt', """Based on the following context from GDPR regulations, guidelines, and case law, please answer the question.
-
-Context:
-{context}
-
-Question: {query}
-
-Please provide a comprehensive answer citing specific GDPR articles, recitals, or guidelines where applicable.""")
-            
-            user_prompt = query_template.format(context=context, query=query)
+        system_prompt, user_prompt, options = self._build_chat_request(
+            query, context, system_prompt, custom_prompt_template
+        )
         
         try:
             logger.info("Generating response with Ollama...")
-            
-            # Get options from config with anti-hallucination settings
-            options = {
-                'temperature': self.temperature,
-                'top_k': self.ollama_config.get('top_k', 40),
-                'top_p': self.ollama_config.get('top_p', 0.9),
-            }
-            
-            # Add optional parameters including num_predict for response length
-            for param in ['num_ctx', 'num_predict', 'repeat_penalty', 'presence_penalty', 'frequency_penalty']:
-                if param in self.ollama_config:
-                    options[param] = self.ollama_config[param]
-            
             logger.info(f"Ollama options: {options}")
             
-            response = ollama.chat(
+            # Identical requests (evaluation loops, repeated demos) skip the LLM entirely
+            cache_key = self._generation_key(system_prompt, user_prompt, options)
+            cached = self._get_cached_generation(cache_key)
+            if cached is not None:
+                logger.info("✓ Returning cached response")
+                return cached
+            
+            response = self.ollama_client.chat(
                 model=self.model,
                 messages=[
                     {'role': 'system', 'content': system_prompt},
                     {'role': 'user', 'content': user_prompt}
                 ],
-                options=options
+                options=options,
+                keep_alive=self.keep_alive
             )
             
             answer = response['message']['content']
@@ -276,17 +619,24 @@ Please provide a comprehensive answer citing specific GDPR articles, recitals, o
             else:
                 logger.info(f"Response generated successfully ({len(answer)} chars)")
             
-            return {
+            result = {
                 'answer': answer,
                 'model': self.model,
                 'context_used': context,
                 'metadata': {
-                    'total_tokens': response.get('total_duration', 0),
+                    'total_tokens': response.get('prompt_eval_count', 0) + response.get('eval_count', 0),
+                    'total_duration': response.get('total_duration', 0),
                     'prompt_tokens': response.get('prompt_eval_count', 0),
                     'completion_tokens': response.get('eval_count', 0)
                 }
             }
             
+            # Empty or truncated answers are not cached, so the next call retries the LLM
+            if answer and len(answer.strip()) >= 10:
+                self._cache_generation(cache_key, result)
+            
+            return result
+            
         except Exception as e:
             logger.error(f"Error generating response: {e}")
             return {
@@ -294,6 +644,128 @@ Please provide a comprehensive answer citing specific GDPR articles, recitals, o
                 'error': True
             }
     
+    def _prefill_prompt_prefix(self) -> None:
+        """
+        Have Ollama evaluate the prompt prefix shared by every query, in the background
+        
+        The system prompt and the query template up to its first placeholder
+        (the context, in the default template) are the same for every request,
+        so this part can be computed before retrieval finishes. The
+        real request then reuses it from Ollama's prompt cache. Uses the same
+        options (num_ctx in particular) so the model is not reloaded.
+        """
+        system_prompt, user_prompt, options = self._build_chat_request(query=PREFIX_MARKER, context=PREFIX_MARKER)
+        user_prefix = user_prompt.partition(PREFIX_MARKER)[0]
+        
+        def prefill():
+            try:
+                self.ollama_client.chat(
+                    model=self.model,
+                    messages=[
+                        {'role': 'system', 'content': system_prompt},
+                        {'role': 'user', 'content': user_prefix}
+                    ],
+                    options={**options, 'num_predict': 1},
+                    keep_alive=self.keep_alive
+                )
+            except Exception as e:
+                logger.debug(f"Prompt prefix prefill failed: {e}")
+        
+        threading.Thread(target=prefill, name="ollama-prefill", daemon=True).start()
+    
+    def generate_response_stream(
+        self,
+        query: str,
+        context: str,
+        system_prompt: Optional[str] = None,
+        custom_prompt_template: Optional[str] = None,
+        flush_chars: int = 80
+    ) -> Iterator[str]:
+        """
+        Generate a response like generate_response, yielding text as it arrives
+        
+        Tokens are buffered and yielded at line ends or once flush_chars have
+        accumulated, so consumers write a few pieces per line rather than one
+        per token. Completed answers are stored in (and served from) the same
+        generation cache as generate_response.
+        
+        Args:
+            query: User query
+            context: Retrieved context
+            system_prompt: System prompt (overrides default)
+            custom_prompt_template: Custom prompt template
+            flush_chars: Buffered characters that trigger a flush
+        
+        Yields:
+            Consecutive pieces of the answer
+        """
+        system_prompt, user_prompt, options = self._build_chat_request(
+            query, context, system_prompt, custom_prompt_template
+        )
+        
+        cache_key = self._generation_key(system_prompt, user_prompt, options)
+        cached = self._get_cached_generation(cache_key)
+        if cached is not None:
+            logger.info("✓ Returning cached response")
+            yield cached['answer']
+            return
+        
+        logger.info("Streaming response from Ollama...")
+        
+        parts = []
+        buffer = []
+        buffered_chars = 0
+        last_chunk = {}
+        try:
+            for chunk in self.ollama_client.chat(
+                model=self.model,
+                messages=[
+                    {'role': 'system', 'content': system_prompt},
+                    {'role': 'user', 'content': user_prompt}
+                ],
+                options=options,
+                keep_alive=self.keep_alive,
+                stream=True
+            ):
+                last_chunk = chunk
+                piece = chunk['message']['content']
+                if not piece:
+                    continue
+                parts.append(piece)
+                buffer.append(piece)
+                buffered_chars += len(piece)
+                if buffered_chars >= flush_chars or '\n' in piece:
+                    yield ''.join(buffer)
+                    buffer = []
+                    buffered_chars = 0
+        except Exception as e:
+            # Same message as generate_response; a partial answer is not cached
+            logger.error(f"Error generating response: {e}")
+            if parts:
+                buffer.append('\n')
+            buffer.append(f"Error generating response: {str(e)}")
+            yield ''.join(buffer)
+            return
+        
+        if buffer:
+            yield ''.join(buffer)
+        
+        answer = ''.join(parts)
+        logger.info(f"Response streamed ({len(answer)} chars)")
+        if len(answer.strip()) >= 10:
+            # The final chunk carries the generation statistics
+            self._cache_generation(cache_key, {
+                'answer': answer,
+                'model': self.model,
+                'context_used': context,
+                'metadata': {
+                    'total_tokens': last_chunk.get('prompt_eval_count', 0) + last_chunk.get('eval_count', 0),
+                    'total_duration': last_chunk.get('total_duration', 0),
+                    'prompt_tokens': last_chunk.get('prompt_eval_count', 0),
+                    'completion_tokens': last_chunk.get('eval_count', 0)
+                }
+            })
+    
     def query(
         self,
         query: str,
@@ -315,9 +787,29 @@ Please provide a comprehensive answer citing specific GDPR articles, recitals, o
         """
         logger.info(f"\n{'='*60}\nProcessing query: {query}\n{'='*60}")
         
+        cache_key = (query, top_k, json.dumps(filters, sort_keys=True, default=str), return_sources)
+        cached = self.query_cache.get(cache_key)
+        if cached is not None:
+            logger.info("✓ Returning cached answer")
+            return copy.deepcopy(cached)
+        
+        # Let the server evaluate the fixed prompt prefix while we search and rerank
+        if self.ollama_config.get('prefill_prompt_prefix', False):
+            self._prefill_prompt_prefix()
+        
         # Retrieve relevant context
         retrieved_docs = self.retrieve_context(query, top_k=top_k, filters=filters)
         
+        result = self._answer(query, retrieved_docs, return_sources)
+        
+        # Don't cache failed generations so the next attempt retries the LLM
+        if not result.get('error'):
+            self.query_cache.put(cache_key, copy.deepcopy(result))
+        
+        return result
+    
+    def _answer(self, query: str, retrieved_docs: List[Dict], return_sources: bool = True) -> Dict:
+        """Generate the answer for a query from already retrieved documents"""
         if not retrieved_docs:
             return {
                 'answer': "I couldn't find relevant information in the GDPR database to answer your question.",
@@ -339,10 +831,14 @@ Please provide a comprehensive answer citing specific GDPR articles, recitals, o
             'metadata': response.get('metadata', {})
         }
         
+        if response.get('error'):
+            result['error'] = True
+        
         if return_sources:
             result['sources'] = [
                 {
                     'text': doc['text'][:500] + '...' if len(doc['text']) > 500 else doc['text'],
+                    'preview': doc['text'][:200],
                     'source': doc['metadata'].get('source'),
                     'document_type': doc['metadata'].get('document_type'),
                     'article_number': doc['metadata'].get('article_number'),
@@ -372,6 +868,10 @@ Please provide a comprehensive answer citing specific GDPR articles, recitals, o
         """
         Process multiple queries
         
+        Retrieval for all queries is done in a single batch; answers are then
+        generated concurrently, up to ollama.num_parallel requests at a time,
+        so the Ollama server can fill its parallel slots.
+        
         Args:
             queries: List of queries
             **kwargs: Additional arguments passed to query()
@@ -379,14 +879,22 @@ Please provide a comprehensive answer citing specific GDPR articles, recitals, o
         Returns:
             List of results
         """
-        results = []
+        return_sources = kwargs.pop('return_sources', True)
+        batch_docs = self.retrieve_context_batch(queries, **kwargs)
         
-        for i, query in enumerate(queries, 1):
+        def answer(item) -> Dict:
+            i, (query, retrieved_docs) = item
             logger.info(f"Processing query {i}/{len(queries)}")
-            result = self.query(query, **kwargs)
-            results.append(result)
+            return self._answer(query, retrieved_docs, return_sources)
+        
+        items = enumerate(zip(queries, batch_docs), 1)
+        max_workers = min(self.num_parallel, len(queries))
+        if max_workers <= 1:
+            return [answer(item) for item in items]
         
-        return results
+        # Generation is network-bound on the Ollama server, so threads are enough
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ollama") as executor:
+            return list(executor.map(answer, items))
     
     def generate(self, prompt: str, temperature: float = 0.3, max_tokens: int = 2000) -> str:
         """
@@ -401,7 +909,7 @@ Please provide a comprehensive answer citing specific GDPR articles, recitals, o
             Generated text
         """
         try:
-            response = ollama.generate(
+            response = self.ollama_client.generate(
                 model=self.model,
                 prompt=prompt,
                 options={
@@ -410,6 +918,7 @@ Please provide a comprehensive answer citing specific GDPR articles, recitals, o
                     'top_k': 40,
                     'top_p': 0.9,
                 },
+                keep_alive=self.keep_alive
             )
             
             return response.get('response', '')
@@ -436,6 +945,8 @@ Please provide a comprehensive answer citing specific GDPR articles, recitals, o
         info = {
             'ollama_model': self.model,
             'ollama_base_url': self.base_url,
+            # Should not exceed the server's OLLAMA_NUM_PARALLEL
+            'ollama_num_parallel': self.num_parallel,
             'vector_store_stats': self.vector_store.get_statistics() if self.vector_store.index else {},
             'retrieval_config': self.retrieval_config
         }
@@ -443,12 +954,21 @@ Please provide a comprehensive answer citing specific GDPR articles, recitals, o
         return info
 
 
-if __name__ == "__main__":
-    import yaml
+@lru_cache(maxsize=None)
+def get_rag_system(config_path: str = "config.yaml") -> GDPRRAGSystem:
+    """
+    Get the shared RAG system for a config file
     
+    The embedding model, reranker and FAISS index are loaded once per process
+    and reused by every caller asking for the same config.
+    """
+    return GDPRRAGSystem(load_config(config_path))
+
+
+if __name__ == "__main__":
+    # Run from the project root: python -m src.rag.gdpr_rag
     # Load config
-    with open("config.yaml", 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_config("config.yaml")
     
     # Initialize RAG system
     rag = GDPRRAGSystem(config)
@@ -79,6 +79,7 @@ class DynamicRemediationEngine:
         """
         self.rag_system = rag_system
         self.llm_client = llm_client
+        self._prompt_template = None
         logger.info("Initialized Dynamic Remediation Engine (LLM-driven)")
     
     def generate_remediation(
@@ -180,22 +181,7 @@ class DynamicRemediationEngine:
     ) -> str:
         """Build specialized remediation prompt using template from config"""
         
-        # Get prompt template from config
-        from yaml import safe_load
-        try:
-            with open('config.yaml', 'r') as f:
-                config = safe_load(f)
-                prompt_template = config.get('prompts', {}).get('remediation_generator_prompt', '')
-        except:
-            # Fallback if config not accessible
-            prompt_template = """Generate remediation for {violation_category}.
-            
-            Articles: {articles}
-            Severity: {severity}
-            
-            GDPR Context: {context}
-            
-            Return JSON with: immediate_actions, short_term, long_term, estimated_cost, estimated_effort, key_roles."""
+        prompt_template = self._get_prompt_template()
         
         articles_str = ", ".join(articles) if articles else "General GDPR"
         
@@ -209,6 +195,29 @@ class DynamicRemediationEngine:
         
         return prompt
     
+    def _get_prompt_template(self) -> str:
+        """Load the remediation prompt template from config (read once per engine)"""
+        if self._prompt_template is not None:
+            return self._prompt_template
+        
+        from ..utils import load_config
+        try:
+            config = load_config('config.yaml')
+            prompt_template = config.get('prompts', {}).get('remediation_generator_prompt', '')
+        except:
+            # Fallback if config not accessible
+            prompt_template = """Generate remediation for {violation_category}.
+            
+            Articles: {articles}
+            Severity: {severity}
+            
+            GDPR Context: {context}
+            
+            Return JSON with: immediate_actions, short_term, long_term, estimated_cost, estimated_effort, key_roles."""
+        
+        self._prompt_template = prompt_template
+        return prompt_template
+    
     def _generate_with_llm(self, prompt: str) -> str:
         """Generate remediation using LLM"""
         if not self.llm_client:
@@ -1,24 +1,72 @@
 """
 Utility functions for the GDPR RAG system
 """
+import copy
 import yaml
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Hashable, Optional
 from loguru import logger
+import os
 import sys
+import threading
+
+# libyaml-backed loader when PyYAML was built with it (same safe semantics, parsed in C)
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=4)
+def _parse_config(config_path: str, mtime: float) -> Dict[str, Any]:
+    """Parse a YAML config file; cached per (path, mtime) so edits are picked up"""
+    with open(config_path, 'r') as f:
+        return yaml.load(f, Loader=YAML_LOADER)
 
 
 def load_config(config_path: str = "config.yaml") -> Dict[str, Any]:
-    """Load configuration from YAML file"""
+    """
+    Load configuration from YAML file
+
+    The file is parsed again only when its modification time changes; every
+    caller gets its own deep copy of the parsed config, so changes made by
+    one caller do not leak into others.
+    """
     try:
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
-        return config
+        path = Path(config_path).resolve()
+        return copy.deepcopy(_parse_config(str(path), path.stat().st_mtime))
     except Exception as e:
         logger.error(f"Error loading config: {e}")
         raise
 
 
+def resolve_device(device: str = "auto") -> str:
+    """Return "cuda" for device "auto" when a CUDA GPU is available, else "cpu"; other values pass through"""
+    if device != "auto":
+        return device
+    try:
+        import torch
+    except ImportError:
+        return "cpu"
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def resolve_embedding_device(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Replace embeddings.device "auto" in config with a concrete device
+
+    Call it right before building the embedding model, so commands that never
+    load a model (collect, process) do not import torch.
+
+    Returns:
+        The same config dict, updated in place
+    """
+    embeddings_config = config.get('embeddings') or {}
+    if embeddings_config.get('device') == 'auto':
+        embeddings_config['device'] = resolve_device('auto')
+    return config
+
+
 def setup_logging(config: Dict[str, Any]) -> None:
     """Setup logging configuration"""
     log_config = config.get('logging', {})
@@ -32,12 +80,16 @@ def setup_logging(config: Dict[str, Any]) -> None:
     # Remove default logger
     logger.remove()
     
+    # Both sinks use enqueue=True: records are handed to a background writer, so
+    # callers never block on console/file I/O and worker processes can log safely
+    
     # Add console logger
     logger.add(
         sys.stderr,
         format=log_format,
         level=log_level,
-        colorize=True
+        colorize=True,
+        enqueue=True
     )
     
     # Add file logger
@@ -47,7 +99,8 @@ def setup_logging(config: Dict[str, Any]) -> None:
         level=log_level,
         rotation="10 MB",
         retention="1 month",
-        compression="zip"
+        compression="zip",
+        enqueue=True
     )
 
 
@@ -63,3 +116,106 @@ def ensure_directories(base_path: Path = Path(".")):
     
     for directory in directories:
         (base_path / directory).mkdir(parents=True, exist_ok=True)
+
+
+_write_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="file-writer")
+
+
+def write_text_async(path: Path, text: str) -> Future:
+    """
+    Write text to a UTF-8 file on a background thread
+
+    Returns a Future resolving to the path once the file is written, so the
+    caller can keep working (printing, building other reports) meanwhile.
+    """
+    def _write() -> Path:
+        Path(path).write_text(text, encoding='utf-8')
+        return path
+
+    return _write_executor.submit(_write)
+
+
+def set_faiss_threads(config: Dict[str, Any]) -> Optional[int]:
+    """
+    Set the number of OpenMP threads FAISS uses for building and searching
+
+    Uses faiss.omp_num_threads from the config, or every available CPU.
+    Returns the thread count, or None when faiss is not installed.
+    """
+    try:
+        import faiss
+    except ImportError:
+        return None
+
+    num_threads = config.get('faiss', {}).get('omp_num_threads') or os.cpu_count()
+    faiss.omp_set_num_threads(num_threads)
+    return num_threads
+
+
+def tune_faiss_index(index, config: Dict[str, Any]) -> None:
+    """
+    Tune a loaded FAISS index for single-query latency
+
+    FAISS parallelises over the queries of a batch by default, so a single
+    query runs on one core. For IVF indices, parallel_mode 2 splits the
+    search over inverted lists instead so one query can use all threads,
+    and nprobe sets how many lists are scanned per query.
+    """
+    num_threads = set_faiss_threads(config)
+    if num_threads is None or index is None:
+        return
+
+    import faiss
+    faiss_config = config.get('faiss', {})
+
+    try:
+        ivf_index = faiss.extract_index_ivf(index)
+    except RuntimeError:
+        # Flat and HNSW indices have no inverted lists to split over
+        return
+
+    ivf_index.parallel_mode = faiss_config.get('parallel_mode', 2)
+    ivf_index.nprobe = faiss_config.get('nprobe', 16)
+    logger.info(
+        f"FAISS search using {num_threads} threads "
+        f"(parallel_mode={ivf_index.parallel_mode}, nprobe={ivf_index.nprobe})"
+    )
+
+
+class LRUCache:
+    """Small thread-safe in-memory cache that evicts the least recently used entry"""
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return the cached value for key (marking it as recently used)"""
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the oldest entries beyond maxsize"""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
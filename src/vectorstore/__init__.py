@@ -0,0 +1 @@
+"""Vector store modules"""
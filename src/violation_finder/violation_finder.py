@@ -2,14 +2,14 @@
 GDPR Violation and Risk Finder
 Specialized module for identifying GDPR violations and assessing compliance risks
 """
-import sys
 from pathlib import Path
-sys.path.append(str(Path(__file__).parent.parent))
-
 from typing import Dict, List, Optional, Tuple
 from loguru import logger
 import json
+import re
 from dataclasses import dataclass, asdict
+from enum import Enum
+from functools import lru_cache
 
 try:
     import ollama
@@ -17,8 +17,8 @@ except ImportError:
     logger.error("Ollama package not installed. Install with: pip install ollama")
     raise
 
-from rag.gdpr_rag import GDPRRAGSystem
-from remediation.remediation_engine import RemediationEngine, RemediationGuidance
+from ..rag.gdpr_rag import GDPRRAGSystem, get_rag_system
+from ..remediation.remediation_engine import RemediationEngine, RemediationGuidance
 
 
 @dataclass
@@ -31,7 +31,6 @@ class SourceCitation:
     relevance_score: float  # How relevant this source is (0-1)
 
 
-@dataclass
 @dataclass
 class GDPRViolation:
     """Represents a potential GDPR violation with verifiable sources"""
@@ -65,15 +64,20 @@ class RiskAssessment:
     data_subject_rights_impact: str
 
 
+def _report_dict_factory(items) -> Dict:
+    """asdict() dict factory that stores remediation enums (priority, complexity) by value"""
+    return {key: value.value if isinstance(value, Enum) else value for key, value in items}
+
+
 class GDPRViolationFinder:
     """Identifies GDPR violations and assesses compliance risks"""
     
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, rag_system: Optional[GDPRRAGSystem] = None):
         self.config = config
-        self.rag_system = GDPRRAGSystem(config)
+        self.rag_system = rag_system or GDPRRAGSystem(config)
         
         # Initialize DYNAMIC remediation engine with RAG and LLM access
-        from remediation.remediation_engine_dynamic import DynamicRemediationEngine
+        from ..remediation.remediation_engine_dynamic import DynamicRemediationEngine
         self.remediation_engine = DynamicRemediationEngine(
             rag_system=self.rag_system,
             llm_client=self.rag_system  # RAG system has LLM client
@@ -86,13 +90,20 @@ class GDPRViolationFinder:
         
         logger.info("Initialized GDPR Violation Finder with Remediation Engine")
     
-    def analyze_scenario(self, scenario: str, context_type: Optional[str] = None) -> RiskAssessment:
+    def analyze_scenario(
+        self,
+        scenario: str,
+        context_type: Optional[str] = None,
+        relevant_context: Optional[List[Dict]] = None
+    ) -> RiskAssessment:
         """
         Analyze a scenario for GDPR violations and risks
         
         Args:
             scenario: Description of the data processing scenario
             context_type: Optional context (e.g., "data_breach", "processing_activity")
+            relevant_context: Regulations already retrieved for this scenario
+                (see retrieve_regulations_batch); retrieved here if omitted
         
         Returns:
             RiskAssessment object with detailed analysis
@@ -100,8 +111,37 @@ class GDPRViolationFinder:
         logger.info(f"Analyzing scenario for GDPR violations...")
         
         # Step 1: Retrieve relevant GDPR articles and guidelines
-        relevant_context = self._retrieve_relevant_regulations(scenario, context_type)
+        if relevant_context is None:
+            relevant_context = self._retrieve_relevant_regulations(scenario, context_type)
+        
+        return self._analyze_with_context(scenario, relevant_context)
+    
+    def analyze_scenarios(
+        self,
+        scenarios: List[str],
+        context_type: Optional[str] = None
+    ) -> List[RiskAssessment]:
+        """
+        Analyze several scenarios, sharing one batched retrieval pass
+        
+        Args:
+            scenarios: Descriptions of the data processing scenarios
+            context_type: Optional context applied to every scenario
+        
+        Returns:
+            One RiskAssessment per scenario, in input order
+        """
+        logger.info(f"Analyzing {len(scenarios)} scenarios for GDPR violations...")
+        
+        contexts = self.retrieve_regulations_batch(scenarios, context_type)
         
+        return [
+            self._analyze_with_context(scenario, relevant_context)
+            for scenario, relevant_context in zip(scenarios, contexts)
+        ]
+    
+    def _analyze_with_context(self, scenario: str, relevant_context: List[Dict]) -> RiskAssessment:
+        """Identify violations, generate remediation and assess risk for retrieved context"""
         # Step 2: Identify potential violations (FIRST LLM CALL - focused on finding violations)
         violations = self._identify_violations(scenario, relevant_context)
         
@@ -147,29 +187,54 @@ class GDPRViolationFinder:
     
     def _retrieve_relevant_regulations(self, scenario: str, context_type: Optional[str]) -> List[Dict]:
         """Retrieve relevant GDPR regulations dynamically based on scenario content"""
+        return self.retrieve_regulations_batch([scenario], context_type)[0]
+    
+    def retrieve_regulations_batch(
+        self,
+        scenarios: List[str],
+        context_type: Optional[str] = None
+    ) -> List[List[Dict]]:
+        """
+        Retrieve relevant GDPR regulations for several scenarios with batched searches
+        
+        Args:
+            scenarios: Descriptions of the data processing scenarios
+            context_type: Optional context applied to every scenario
+        
+        Returns:
+            One list of regulation chunks per scenario, usable as
+            analyze_scenario(..., relevant_context=...)
+        """
         
         # Multi-strategy retrieval - no hardcoded hints
-        all_results = []
-        
-        # Strategy 1: Use full scenario for semantic search
-        query1 = scenario[:500]  # First 500 chars of scenario
-        results1 = self.rag_system.retrieve_context(query1, top_k=15)
-        all_results.extend(results1)
-        
-        # Strategy 2: Extract specific Article mentions if present
-        import re
-        article_mentions = re.findall(r'article\s+(\d+)', scenario.lower())
-        if article_mentions:
-            for article_num in article_mentions[:3]:
-                query2 = f"Article {article_num} GDPR"
-                results2 = self.rag_system.retrieve_context(query2, top_k=5)
-                all_results.extend(results2)
+        
+        # Strategy 1: Use full scenario for semantic search (first 500 chars of each scenario)
+        scenario_results = self.rag_system.retrieve_context_batch(
+            [scenario[:500] for scenario in scenarios], top_k=15
+        )
         
         # Strategy 3: Search for general GDPR compliance requirements
-        query3 = "GDPR requirements obligations compliance"
-        results3 = self.rag_system.retrieve_context(query3, top_k=10)
-        all_results.extend(results3)
+        # (the query is the same for every scenario, so it is searched once)
+        general_results = self.rag_system.retrieve_context("GDPR requirements obligations compliance", top_k=10)
+        
+        contexts = []
+        for scenario, results1 in zip(scenarios, scenario_results):
+            all_results = list(results1)
+            
+            # Strategy 2: Extract specific Article mentions if present
+            article_mentions = re.findall(r'article\s+(\d+)', scenario.lower())
+            if article_mentions:
+                article_queries = [f"Article {article_num} GDPR" for article_num in article_mentions[:3]]
+                for results2 in self.rag_system.retrieve_context_batch(article_queries, top_k=5):
+                    all_results.extend(results2)
+            
+            all_results.extend(general_results)
+            contexts.append(self._select_unique_results(all_results))
         
+        return contexts
+    
+    def _select_unique_results(self, all_results: List[Dict]) -> List[Dict]:
+        """Deduplicate retrieved chunks, preferring Article text over recitals"""
         # Deduplicate and prioritize
         seen_ids = set()
         unique_results = []
@@ -379,20 +444,6 @@ class GDPRViolationFinder:
         
         return violations if violations else [self._create_fallback_violation(response)]
     
-    def _create_fallback_violation(self, response: str) -> GDPRViolation:
-        """Create a fallback violation when parsing fails"""
-        return GDPRViolation(
-            category="GDPR Compliance Review",
-            severity="Medium",
-            articles=[],
-            description="Automated analysis identified potential compliance issues",
-            highlighted_text="",
-            recommendation="Conduct detailed manual compliance review with legal counsel",
-            risk_score=5.0,
-            evidence=response[:500] if response else "",
-            context_metadata={'source': 'Fallback', 'verification': 'Manual review recommended - automated parsing incomplete'}
-        )
-    
     def _extract_citations(self, violation_data: dict, context: List[Dict]) -> Optional[List[SourceCitation]]:
         """Extract source citations with ACCURACY VALIDATION - 80%+ target"""
         articles = violation_data.get('articles', [])
@@ -618,225 +669,245 @@ class GDPRViolationFinder:
         Returns:
             Formatted report
         """
+        return self._render_report(self._report_data(scenario, assessment), format)
+    
+    def generate_compliance_reports(
+        self,
+        scenario: str,
+        assessment: RiskAssessment,
+        formats: Tuple[str, ...] = ("markdown", "json")
+    ) -> Dict[str, str]:
+        """
+        Generate the compliance report in several formats from one assessment
+        
+        The assessment is converted to plain report data once and every
+        format is rendered from that.
+        
+        Args:
+            scenario: The analyzed scenario
+            assessment: RiskAssessment result
+            formats: Output formats ("markdown", "json", "text")
+        
+        Returns:
+            Dict mapping each format to its formatted report
+        """
+        data = self._report_data(scenario, assessment)
+        return {fmt: self._render_report(data, fmt) for fmt in formats}
+    
+    @staticmethod
+    def _report_data(scenario: str, assessment: RiskAssessment) -> Dict:
+        """Plain (JSON-ready) report data: the scenario and the assessment as nested dicts"""
+        # asdict() converts nested SourceCitation/RemediationGuidance dataclasses too
+        return {
+            "scenario": scenario,
+            "assessment": asdict(assessment, dict_factory=_report_dict_factory)
+        }
+    
+    @staticmethod
+    def _render_report(data: Dict, format: str) -> str:
+        """Render report data from _report_data in the given format"""
         if format == "json":
-            # Convert violations with proper dataclass handling
-            violations_data = []
-            for v in assessment.violations:
-                v_dict = asdict(v)
-                # Convert SourceCitation objects if present
-                if v.source_citations:
-                    v_dict['source_citations'] = [asdict(cit) for cit in v.source_citations]
-                violations_data.append(v_dict)
-            
-            return json.dumps({
-                "scenario": scenario,
-                "assessment": {
-                    "overall_risk_level": assessment.overall_risk_level,
-                    "risk_score": assessment.risk_score,
-                    "violations": violations_data,
-                    "compliance_gaps": assessment.compliance_gaps,
-                    "recommendations": assessment.recommendations,
-                    "legal_basis_analysis": assessment.legal_basis_analysis,
-                    "data_subject_rights_impact": assessment.data_subject_rights_impact
-                }
-            }, indent=2)
+            return json.dumps(data, indent=2)
+        
+        scenario = data["scenario"]
+        assessment = data["assessment"]
         
-        elif format == "markdown":
+        if format == "markdown":
             report = f"""# GDPR Compliance Risk Assessment Report
 
 ## Scenario
 {scenario}
 
 ## Overall Risk Assessment
-- **Risk Level**: {assessment.overall_risk_level}
-- **Risk Score**: {assessment.risk_score:.1f}/10
+- **Risk Level**: {assessment['overall_risk_level']}
+- **Risk Score**: {assessment['risk_score']:.1f}/10
 
 ## Identified Violations
 
 """
-            for i, violation in enumerate(assessment.violations, 1):
-                report += f"""### {i}. {violation.category}
-**Severity**: {violation.severity}  
-**Risk Score**: {violation.risk_score}/10  
-**Relevant Articles**: {', '.join(violation.articles) if violation.articles else 'N/A'}
+            for i, violation in enumerate(assessment['violations'], 1):
+                report += f"""### {i}. {violation['category']}
+**Severity**: {violation['severity']}  
+**Risk Score**: {violation['risk_score']}/10  
+**Relevant Articles**: {', '.join(violation['articles']) if violation['articles'] else 'N/A'}
 
-**Description**: {violation.description}
+**Description**: {violation['description']}
 
 """
                 # Add highlighted problematic text
-                if violation.highlighted_text:
+                if violation['highlighted_text']:
                     report += f"""#### 🔴 Problematic Text from Your Document
 ```
-{violation.highlighted_text}
+{violation['highlighted_text']}
 ```
 
 """
                 
-                report += f"""**Evidence**: {violation.evidence}
+                report += f"""**Evidence**: {violation['evidence']}
 
 """
                 
                 # Add GDPR source citations
-                if violation.source_citations:
+                if violation['source_citations']:
                     report += f"""#### 📚 GDPR Source Citations
 
 """
-                    for j, citation in enumerate(violation.source_citations, 1):
-                        report += f"""##### Citation {j}: {citation.article_or_recital}
-**Source**: {citation.source_document}  
-**Relevance**: {citation.relevance_score:.0%}
+                    for j, citation in enumerate(violation['source_citations'], 1):
+                        report += f"""##### Citation {j}: {citation['article_or_recital']}
+**Source**: {citation['source_document']}  
+**Relevance**: {citation['relevance_score']:.0%}
 
 **Quoted from GDPR**:
-> {citation.quoted_text}
+> {citation['quoted_text']}
 
-**Context**: {citation.context}
+**Context**: {citation['context']}
 
 """
                 
-                report += f"""**Recommendation**: {violation.recommendation}
+                report += f"""**Recommendation**: {violation['recommendation']}
 
 """
                 
                 # Add verification notes
-                if violation.verification_notes:
+                if violation['verification_notes']:
                     report += f"""#### ✓ Verification
-{violation.verification_notes}
+{violation['verification_notes']}
 
 """
                 
                 # Add professional remediation guidance
-                if violation.remediation_guidance:
-                    rem = violation.remediation_guidance
+                if violation['remediation_guidance']:
+                    rem = violation['remediation_guidance']
                     report += f"""---
 
 ## 🔧 Professional Remediation Guidance
 
 ### Priority & Effort
-- **Priority**: {rem.priority.value}
-- **Complexity**: {rem.complexity.value}
-- **Estimated Effort**: {rem.estimated_effort}
-- **Estimated Cost**: {rem.estimated_cost_range}
+- **Priority**: {rem['priority']}
+- **Complexity**: {rem['complexity']}
+- **Estimated Effort**: {rem['estimated_effort']}
+- **Estimated Cost**: {rem['estimated_cost_range']}
 
 ### 🚨 Immediate Actions (0-7 days)
 
 """
-                    for action in rem.immediate_actions:
+                    for action in rem['immediate_actions']:
                         report += f"{action}\n"
                     
                     report += f"""
 ### 📅 Short-Term Solutions (1-3 months)
 
 """
-                    for solution in rem.short_term_solutions:
+                    for solution in rem['short_term_solutions']:
                         report += f"{solution}\n"
                     
                     report += f"""
 ### 🎯 Long-Term Improvements (3-6 months)
 
 """
-                    for improvement in rem.long_term_improvements:
+                    for improvement in rem['long_term_improvements']:
                         report += f"{improvement}\n"
                     
                     # Add detailed implementation steps
-                    if rem.detailed_steps:
+                    if rem['detailed_steps']:
                         report += f"""
 ### 📋 Implementation Steps
 
 """
-                        for step in rem.detailed_steps:
+                        for step in rem['detailed_steps']:
                             report += f"""
-**Step {step.step_number}: {step.action}**
-- **Owner**: {step.owner}
-- **Timeline**: {step.timeline}
-- **Success Criteria**: {step.success_criteria}
-- **Resources Needed**: {', '.join(step.resources_needed)}
+**Step {step['step_number']}: {step['action']}**
+- **Owner**: {step['owner']}
+- **Timeline**: {step['timeline']}
+- **Success Criteria**: {step['success_criteria']}
+- **Resources Needed**: {', '.join(step['resources_needed'])}
 
 """
                     
                     # Add verification checklist
-                    if rem.verification_checklist:
+                    if rem['verification_checklist']:
                         report += f"""
 ### ✅ Verification Checklist
 
 """
-                        for item in rem.verification_checklist:
+                        for item in rem['verification_checklist']:
                             report += f"{item}\n"
                     
                     # Add technical requirements
-                    if rem.technical_requirements:
+                    if rem['technical_requirements']:
                         report += f"""
 ### 🔧 Technical Requirements
 
 """
-                        for req in rem.technical_requirements:
+                        for req in rem['technical_requirements']:
                             report += f"- {req}\n"
                     
                     # Add policy requirements
-                    if rem.policy_requirements:
+                    if rem['policy_requirements']:
                         report += f"""
 ### 📄 Policy & Documentation Requirements
 
 """
-                        for pol in rem.policy_requirements:
+                        for pol in rem['policy_requirements']:
                             report += f"- {pol}\n"
                     
                     # Add training requirements
-                    if rem.training_requirements:
+                    if rem['training_requirements']:
                         report += f"""
 ### 🎓 Training Requirements
 
 """
-                        for training in rem.training_requirements:
+                        for training in rem['training_requirements']:
                             report += f"- {training}\n"
                     
                     # Add best practices
-                    if rem.best_practices:
+                    if rem['best_practices']:
                         report += f"""
 ### 💡 Best Practices
 
 """
-                        for practice in rem.best_practices:
+                        for practice in rem['best_practices']:
                             report += f"- {practice}\n"
                     
                     # Add resources
-                    if rem.helpful_resources:
+                    if rem['helpful_resources']:
                         report += f"""
 ### 📚 Helpful Resources
 
 """
-                        for resource in rem.helpful_resources:
+                        for resource in rem['helpful_resources']:
                             report += f"- {resource}\n"
                     
                     # Add similar cases
-                    if rem.similar_cases:
+                    if rem['similar_cases']:
                         report += f"""
 ### ⚖️ Similar Enforcement Cases
 
 """
-                        for case in rem.similar_cases:
+                        for case in rem['similar_cases']:
                             report += f"- {case}\n"
                     
                     # Add ongoing monitoring
-                    if rem.ongoing_monitoring:
+                    if rem['ongoing_monitoring']:
                         report += f"""
 ### 📊 Ongoing Monitoring
 
-{rem.ongoing_monitoring}
+{rem['ongoing_monitoring']}
 
 """
                 
                 report += "---\n\n"
             
             # Summary sections
-            if assessment.compliance_gaps:
+            if assessment['compliance_gaps']:
                 report += "## 📋 Compliance Gaps Summary\n"
-                for gap in assessment.compliance_gaps:
+                for gap in assessment['compliance_gaps']:
                     report += f"- {gap}\n"
                 report += "\n"
             
-            if assessment.recommendations:
+            if assessment['recommendations']:
                 report += "## 🎯 Quick Action Items\n"
-                for i, rec in enumerate(assessment.recommendations, 1):
+                for i, rec in enumerate(assessment['recommendations'], 1):
                     report += f"{i}. {rec}\n"
             
             return report
@@ -844,12 +915,12 @@ class GDPRViolationFinder:
         else:  # text format
             report = f"GDPR COMPLIANCE RISK ASSESSMENT\n\n"
             report += f"Scenario: {scenario}\n\n"
-            report += f"Risk Level: {assessment.overall_risk_level} ({assessment.risk_score:.1f}/10)\n\n"
-            report += f"Violations Found: {len(assessment.violations)}\n\n"
+            report += f"Risk Level: {assessment['overall_risk_level']} ({assessment['risk_score']:.1f}/10)\n\n"
+            report += f"Violations Found: {len(assessment['violations'])}\n\n"
             
-            for i, violation in enumerate(assessment.violations, 1):
-                report += f"{i}. {violation.category} [{violation.severity}]\n"
-                report += f"   {violation.description}\n\n"
+            for i, violation in enumerate(assessment['violations'], 1):
+                report += f"{i}. {violation['category']} [{violation['severity']}]\n"
+                report += f"   {violation['description']}\n\n"
             
             return report
     
@@ -922,12 +993,18 @@ For each violation found, quote the EXACT problematic text from the document abo
         return assessment
 
 
+@lru_cache(maxsize=None)
+def get_violation_finder(config_path: str = "config.yaml") -> GDPRViolationFinder:
+    """Get the shared violation finder for a config file, built on the shared RAG system"""
+    rag_system = get_rag_system(config_path)
+    return GDPRViolationFinder(rag_system.config, rag_system=rag_system)
+
+
 if __name__ == "__main__":
-    import yaml
+    from ..utils import load_config
     
     # Load config
-    with open("config.yaml", 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_config("config.yaml")
     
     # Initialize violation finder
     finder = GDPRViolationFinder(config)
@@ -3,6 +3,7 @@ GDPR Compliance Dashboard - Flask Web Application
 A professional interactive UI for the AI-powered GDPR compliance system
 """
 
+import copy
 import os
 import sys
 import json
@@ -15,8 +16,8 @@ from pathlib import Path
 # Add parent directory to path to import our GDPR system
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+from src.utils import load_config
 from src.violation_finder.violation_finder import GDPRViolationFinder, GDPRViolation, RiskAssessment
-import yaml
 
 app = Flask(__name__)
 app.secret_key = 'gdpr-compliance-secret-key-change-in-production'
@@ -76,8 +77,8 @@ def init_gdpr_system():
         
         # Load config from parent directory
         config_path = os.path.join(project_root, 'config.yaml')
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+        # Copy the shared config before rewriting paths in it
+        config = copy.deepcopy(load_config(config_path))
         
         # Update vectorstore path to absolute path
         if 'faiss' in config and 'store_path' in config['faiss']:
@@ -5,7 +5,7 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from rag.gdpr_rag import GDPRRAG
+from src.rag.gdpr_rag import GDPRRAG
 
 # Initialize
 print("Loading GDPR system...")